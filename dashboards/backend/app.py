@@ -24,9 +24,12 @@ def get_db():
 def query_db(query, args=(), one=False):
     """Execute query and return results"""
     conn = get_db()
-    cur = conn.execute(query, args)
-    rv = [dict(row) for row in cur.fetchall()]
-    conn.close()
+    try:
+        cur = conn.execute(query, args)
+        rv = [dict(row) for row in cur.fetchall()]
+    finally:
+        # Also on errors (e.g. a table that was never loaded)
+        conn.close()
     return (rv[0] if rv else None) if one else rv
 
 # ============================================================================
@@ -450,6 +453,25 @@ def student_dashboard(student_id):
         'predictions': predictions
     })
 
+@app.route('/api/students/<int:student_id>/features', methods=['GET'])
+def student_features(student_id):
+    """Get the student's engineered features from the materialized feature store"""
+    try:
+        features = query_db('SELECT * FROM student_features WHERE student_id = ?',
+                            (student_id,), one=True)
+    except sqlite3.OperationalError:
+        return jsonify({'error': 'Feature store not loaded'}), 404
+    
+    if not features:
+        return jsonify({'error': 'Student not found'}), 404
+    
+    return jsonify({
+        'student_id': student_id,
+        'feature_set_version': features.pop('feature_set_version'),
+        'features_created_at': features.pop('features_created_at'),
+        'features': {key: value for key, value in features.items() if key != 'student_id'}
+    })
+
 @app.route('/api/students/<int:student_id>/performance', methods=['GET'])
 def student_performance(student_id):
     """Get detailed performance metrics"""
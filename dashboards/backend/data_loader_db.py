@@ -7,8 +7,17 @@ import sqlite3
 import pandas as pd
 import json
 import os
+import sys
 from pathlib import Path
 
+# The feature store lives in the ML pipeline's src/ (two levels up)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'src'))
+try:
+    from feature_store import FeatureStore
+    FEATURE_STORE_AVAILABLE = True
+except ImportError:
+    FEATURE_STORE_AVAILABLE = False
+
 class DataLoader:
     def __init__(self, data_dir='data', db_name='students.db'):
         self.data_dir = Path(data_dir)
@@ -36,6 +45,7 @@ class DataLoader:
                 self._load_students() and
                 self._load_predictions() and
                 self._load_analytics() and
+                self._load_features() and
                 self._load_teachers() and
                 self._load_mappings()
             )
@@ -167,6 +177,35 @@ class DataLoader:
             # Analytics is optional, so return True
             return True
     
+    def _load_features(self):
+        """Load models/feature_store - Materialized engineered features"""
+        print("\n🧮 Loading feature store...")
+        if not FEATURE_STORE_AVAILABLE:
+            print(f"   ⚠️  Feature store module not available, skipping")
+            return True
+        try:
+            store = FeatureStore(store_dir=str(Path('models') / 'feature_store'), model_dir='models')
+            manifest = store.manifest()
+            
+            if manifest is None:
+                print(f"   ⚠️  Feature store not found, skipping")
+                return True
+            
+            # Derived features only; the raw columns are already in 'students'
+            df = store.student_features()
+            
+            df.to_sql('student_features', self.conn, if_exists='replace', index=False)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_student_features_student_id "
+                              "ON student_features (student_id)")
+            print(f"   ✅ Loaded {len(df)} feature rows (feature set {manifest['feature_set_version']}, "
+                  f"{manifest['created_at']})")
+            return True
+            
+        except Exception as e:
+            print(f"   ⚠️  Warning: Could not load feature store: {e}")
+            # The feature store is optional, so return True
+            return True
+    
     def _load_teachers(self):
         """Load teachers.json - Faculty information"""
         print("\n👨‍🏫 Loading teachers...")
@@ -242,7 +281,7 @@ class DataLoader:
         print("=" * 60)
         
         # Count records in each table
-        tables = ['students', 'predictions', 'teachers', 'student_teacher_mapping', 'analytics']
+        tables = ['students', 'predictions', 'teachers', 'student_teacher_mapping', 'analytics', 'student_features']
         for table in tables:
             try:
                 cursor.execute(f"SELECT COUNT(*) FROM {table}")
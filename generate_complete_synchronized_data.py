@@ -5,18 +5,166 @@ Maintains real-world college structure
 """
 
 import random
+import numpy as np
 import pandas as pd
 from datetime import timedelta, datetime
+import gzip
 import json
 import os
+import shutil
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from table_schemas import TABLE_SCHEMAS, apply_schema
+
+# zstd output is optional
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# Named benchmark tiers (TPC-H style): tier name -> scale factor
+BENCHMARK_TIERS = {
+    'sf1': 1,
+    'sf10': 10,
+    'sf100': 100,
+    'sf1000': 1000
+}
+
+# Tiers from this scale factor up are generated sharded, in blocks of SHARDED_TIER_BLOCK_SIZE
+# students, instead of holding every table in memory at once
+SHARDED_TIER_MIN_SCALE_FACTOR = 100
+SHARDED_TIER_BLOCK_SIZE = 10000
+
+
+class ChunkedCSVWriter:
+    """Append DataFrame chunks to a single CSV file, optionally gzip/zstd compressed"""
+    
+    EXTENSIONS = {None: '.csv', 'gzip': '.csv.gz', 'zstd': '.csv.zst'}
+    
+    def __init__(self, base_path, compression=None):
+        if compression not in self.EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == 'zstd' and not ZSTD_AVAILABLE:
+            raise ImportError("zstd compression needs zstandard. Run: pip install zstandard")
+        
+        self.path = base_path + self.EXTENSIONS[compression]
+        self.rows = 0
+        self.columns = None
+        
+        if compression == 'gzip':
+            self._file = gzip.open(self.path, 'wt', encoding='utf-8', newline='')
+        elif compression == 'zstd':
+            self._file = zstandard.open(self.path, 'wt', encoding='utf-8', newline='')
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8', newline='')
+    
+    def write(self, df):
+        """Append one chunk; the header is written with the first non-empty schema"""
+        if df.empty and len(df.columns) == 0:
+            return
+        
+        header = self.columns is None
+        if header:
+            self.columns = list(df.columns)
+        df.to_csv(self._file, index=False, header=header, columns=self.columns)
+        self.rows += len(df)
+    
+    def close(self):
+        self._file.close()
+
+
+class SQLiteBulkWriter:
+    """Bulk-load DataFrame chunks into SQLite: fast-load PRAGMAs, executemany, indexes built last"""
+    
+    FAST_LOAD_PRAGMAS = [
+        'PRAGMA journal_mode = OFF',
+        'PRAGMA synchronous = OFF',
+        'PRAGMA locking_mode = EXCLUSIVE',
+        'PRAGMA temp_store = MEMORY',
+        'PRAGMA cache_size = -200000'
+    ]
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        for pragma in self.FAST_LOAD_PRAGMAS:
+            self.conn.execute(pragma)
+        self.columns = {}
+        self.rows = {}
+    
+    def _create_table(self, table, df, schema=None):
+        """
+        (Re)create the table without indexes. Column affinity follows the declared
+        schema dtype where there is one, so a column that happens to be all null in
+        the first chunk still gets its numeric type; other columns follow the chunk dtype.
+        """
+        def affinity(dtype):
+            dtype = pd.api.types.pandas_dtype(dtype)
+            if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+                return 'INTEGER'
+            if pd.api.types.is_float_dtype(dtype):
+                return 'REAL'
+            return 'TEXT'
+        
+        schema = schema or {}
+        column_defs = ', '.join(f'"{col}" {affinity(schema.get(col, dtype))}' for col, dtype in df.dtypes.items())
+        self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self.conn.execute(f'CREATE TABLE "{table}" ({column_defs})')
+        self.columns[table] = list(df.columns)
+        self.rows[table] = 0
+    
+    def write(self, table, df, schema=None):
+        """Insert one chunk inside a single transaction; schema is {column: dtype} (see TABLE_SCHEMAS)"""
+        if df.empty and len(df.columns) == 0:
+            return
+        if table not in self.columns:
+            self._create_table(table, df, schema)
+        
+        columns = self.columns[table]
+        values = df[columns].astype(object)
+        rows = values.where(df[columns].notna(), None).values.tolist()
+        placeholders = ', '.join('?' * len(columns))
+        
+        with self.conn:
+            self.conn.executemany(f'INSERT INTO "{table}" VALUES ({placeholders})', rows)
+        self.rows[table] += len(rows)
+    
+    def create_indexes(self, indexes):
+        """Build indexes once all rows are in: {table: [column or (columns...)]}"""
+        with self.conn:
+            for table, index_columns in indexes.items():
+                if table not in self.columns:
+                    continue
+                for cols in index_columns:
+                    cols = (cols,) if isinstance(cols, str) else cols
+                    name = f'idx_{table}_' + '_'.join(cols)
+                    col_list = ', '.join(f'"{c}"' for c in cols)
+                    self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({col_list})')
+        self.conn.execute('ANALYZE')
+    
+    def close(self):
+        self.conn.close()
 
 
 class CompleteSynchronizedDataGenerator:
-    def __init__(self):
+    def __init__(self, seed=None, vectorized=False, scale_factor=1):
+        # Seed both RNGs so a run can be reproduced exactly
+        self.seed = seed
+        self.vectorized = vectorized
+        if seed is not None:
+            random.seed(seed)
+        self.rng = np.random.default_rng(seed)
+        
         self.start_date = datetime(2025, 8, 1)
         self.current_date = datetime(2025, 12, 1)
         
         # College structure - REALISTIC distribution
+        self.scale_factor = scale_factor
         self.branches = {
             'CS': {'name': 'Computer Science', 'students_per_year': [60, 55, 50, 45]},
             'EC': {'name': 'Electronics & Communication', 'students_per_year': [50, 48, 45, 40]},
@@ -25,6 +173,13 @@ class CompleteSynchronizedDataGenerator:
             'EE': {'name': 'Electrical Engineering', 'students_per_year': [45, 42, 40, 35]}
         }
         
+        # Scale cohorts and teaching sections together so the student/teacher ratio holds
+        for branch_info in self.branches.values():
+            branch_info['students_per_year'] = [
+                max(1, round(n * scale_factor)) for n in branch_info['students_per_year']
+            ]
+        self.sections_per_year = max(1, round(scale_factor))
+        
         # Names database
         self.first_names_male = [
             'Aarav', 'Vivaan', 'Aditya', 'Vihaan', 'Arjun', 'Sai', 'Arnav', 'Ayaan',
@@ -72,6 +227,16 @@ class CompleteSynchronizedDataGenerator:
             'Electronics', 'Mechanical Engineering', 'English', 'Data Structures'
         ]
         
+        # Exams per subject: (name, max marks, date)
+        self.exam_types = [
+            ('Unit Test 1', 20, '2025-09-15'),
+            ('Unit Test 2', 20, '2025-10-20'),
+            ('Mid Semester', 30, '2025-11-10'),
+            ('Assignment 1', 10, '2025-09-30'),
+            ('Assignment 2', 10, '2025-10-30'),
+            ('Lab Internal', 10, '2025-11-20')
+        ]
+        
         # Extracurricular activities
         self.clubs_activities = {
             'Technical': ['Coding Club', 'Robotics Club', 'AI/ML Club', 'Web Development Club'],
@@ -86,8 +251,8 @@ class CompleteSynchronizedDataGenerator:
         print("🎓 COMPLETE SYNCHRONIZED DATA GENERATOR")
         print("="*80)
     
-    def generate_all_data(self, output_dir='data/dummy_data'):
-        """Master function to generate all data in correct order"""
+    def generate_all_data(self, output_dir='data/dummy_data', output_format='csv'):
+        """Master function to generate all data in correct order (output_format: 'csv' or 'parquet')"""
         
         os.makedirs(output_dir, exist_ok=True)
         os.makedirs(os.path.dirname(output_dir), exist_ok=True)
@@ -98,74 +263,185 @@ class CompleteSynchronizedDataGenerator:
         teachers_df.to_csv(f'{output_dir}/teachers.csv', index=False)
         
         # STEP 2: Generate students assigned to teachers
+        print("\n👨‍🎓 STEP 2: Generating Students...")
+        students_df = self.generate_students(teachers_df)
+        self.write_table(students_df, output_dir, '01_students_master', output_format)
+        
+        # STEPS 3-11: Generate supporting data
+        tables = self.generate_student_tables(students_df)
+        for table_name, df in tables.items():
+            self.write_table(df, output_dir, table_name, output_format)
+        
+        (family_df, academic_df, attendance_df, marks_df, assignments_df, behavior_df,
+         library_df, fee_df, extra_reg_df, extra_details_df, extra_attendance_df) = tables.values()
+        
+        # STEP 12: Generate teacher credentials and mappings
+        print("\n🔐 STEP 12: Generating Teacher Credentials...")
+        self.generate_teacher_credentials(teachers_df, students_df, output_dir)
+        
+        # Generate summary
+        self.generate_summary_report(output_dir, teachers_df, students_df, family_df, academic_df,
+                                    attendance_df, marks_df, assignments_df, behavior_df, 
+                                    library_df, fee_df, extra_reg_df, extra_details_df, extra_attendance_df)
+        
+        print("\n" + "="*80)
+        print("✅ COMPLETE DATA GENERATION SUCCESSFUL!")
+        print("="*80)
+        print(f"\n📁 Output Directory: {output_dir}")
+        print(f"\n📊 Generated Files:")
+        print(f"   - teachers.csv ({len(teachers_df)} teachers)")
+        print(f"   - 01_students_master.csv ({len(students_df)} students)")
+        print(f"   - 02-12: All supporting data files ({output_format})")
+        print(f"   - teachers.json (login credentials)")
+        print(f"   - student_teacher_mapping.json")
+        
+        return {
+            'teachers': teachers_df,
+            'students': students_df,
+            'family': family_df,
+            'academic': academic_df
+        }
+    
+    def write_table(self, df, output_dir, table_name, output_format='csv'):
+        """Write one of the 12 tables as CSV or as typed Parquet (explicit schema, categoricals)"""
+        if output_format == 'parquet':
+            apply_schema(df, table_name).to_parquet(f'{output_dir}/{table_name}.parquet', index=False)
+        elif output_format == 'csv':
+            df.to_csv(f'{output_dir}/{table_name}.csv', index=False)
+        else:
+            raise ValueError(f"Unsupported output format: {output_format}")
+    
+    def generate_all_data_streaming(self, output_dir='data/dummy_data', chunk_size=10000, compression=None):
+        """
+        Generate all data with bounded memory
+        
+        Students are processed in blocks of `chunk_size`; each block's tables are appended
+        to the output files and dropped, so peak memory depends on the chunk size rather
+        than the total transactional volume. The summary report is skipped in this mode.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        
+        print("\n📚 STEP 1: Generating Teachers...")
+        teachers_df = self.generate_teachers()
+        teachers_df.to_csv(f'{output_dir}/teachers.csv', index=False)
+        
         print("\n👨‍🎓 STEP 2: Generating Students...")
         students_df = self.generate_students(teachers_df)
         students_df.to_csv(f'{output_dir}/01_students_master.csv', index=False)
         
-        # STEP 3: Generate supporting data
+        writers = {}
+        try:
+            for chunk_num, tables in enumerate(self.iter_student_tables(students_df, chunk_size), 1):
+                for table_name, df in tables.items():
+                    if table_name not in writers:
+                        writers[table_name] = ChunkedCSVWriter(f'{output_dir}/{table_name}', compression)
+                    writers[table_name].write(df)
+                print(f"   💾 Wrote chunk {chunk_num} ({min(chunk_num * chunk_size, len(students_df))}/{len(students_df)} students)")
+        finally:
+            for writer in writers.values():
+                writer.close()
+        
+        print("\n🔐 STEP 12: Generating Teacher Credentials...")
+        self.generate_teacher_credentials(teachers_df, students_df, output_dir)
+        
+        print("\n" + "="*80)
+        print("✅ STREAMING DATA GENERATION SUCCESSFUL!")
+        print("="*80)
+        for writer in writers.values():
+            print(f"   - {os.path.basename(writer.path)} ({writer.rows} rows)")
+        
+        return {table_name: writer.rows for table_name, writer in writers.items()}
+    
+    def generate_to_sqlite(self, db_path='data/dummy_data.db', chunk_size=10000):
+        """
+        Generate the raw tables straight into a SQLite database (no CSV round trip)
+        
+        Tables are named after the CSV files without the numeric prefix
+        (e.g. 04_daily_attendance -> daily_attendance). Rows are inserted one student
+        chunk per transaction; student_id and lookup indexes are created after loading.
+        """
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        
+        writer = SQLiteBulkWriter(db_path)
+        try:
+            print("\n📚 STEP 1: Generating Teachers...")
+            teachers_df = self.generate_teachers()
+            writer.write('teachers', teachers_df)
+            
+            print("\n👨‍🎓 STEP 2: Generating Students...")
+            students_df = self.generate_students(teachers_df)
+            writer.write('students_master', students_df, TABLE_SCHEMAS['01_students_master'])
+            
+            for chunk_num, tables in enumerate(self.iter_student_tables(students_df, chunk_size), 1):
+                for table_name, df in tables.items():
+                    writer.write(table_name.split('_', 1)[1], df, TABLE_SCHEMAS[table_name])
+                print(f"   💾 Loaded chunk {chunk_num} ({min(chunk_num * chunk_size, len(students_df))}/{len(students_df)} students)")
+            
+            print("\n🗂️ Building indexes...")
+            indexes = {table: ['student_id'] for table in writer.columns if table != 'teachers'}
+            indexes['teachers'] = ['teacher_id', ('branch', 'year')]
+            indexes['students_master'] = ['student_id', ('branch', 'year'), 'primary_teacher_id']
+            indexes['daily_attendance'] = ['student_id', 'date']
+            indexes['marks_exams'] = ['student_id', ('subject', 'exam_type')]
+            writer.create_indexes(indexes)
+        finally:
+            writer.close()
+        
+        print("\n" + "="*80)
+        print(f"✅ SQLITE BULK GENERATION SUCCESSFUL: {db_path}")
+        print("="*80)
+        for table, rows in writer.rows.items():
+            print(f"   - {table} ({rows} rows)")
+        
+        return writer.rows
+    
+    def iter_student_tables(self, students_df, chunk_size=10000):
+        """Yield the per-student tables (files 02-12) one block of students at a time"""
+        for start in range(0, len(students_df), chunk_size):
+            yield self.generate_student_tables(students_df.iloc[start:start + chunk_size])
+    
+    def generate_student_tables(self, students_df):
+        """Generate every per-student table (files 02-12) for the given students"""
         print("\n👨‍👩‍👦 STEP 3: Generating Family Background...")
         family_df = self.generate_family_background(students_df)
-        family_df.to_csv(f'{output_dir}/02_family_background.csv', index=False)
         
         print("\n📊 STEP 4: Generating Academic History...")
         academic_df = self.generate_academic_history(students_df)
-        academic_df.to_csv(f'{output_dir}/03_academic_history.csv', index=False)
         
         print("\n📅 STEP 5: Generating Attendance...")
         attendance_df = self.generate_daily_attendance(students_df)
-        attendance_df.to_csv(f'{output_dir}/04_daily_attendance.csv', index=False)
         
         print("\n📝 STEP 6: Generating Marks...")
         marks_df = self.generate_marks_data(students_df)
-        marks_df.to_csv(f'{output_dir}/05_marks_exams.csv', index=False)
         
         print("\n📋 STEP 7: Generating Assignments...")
         assignments_df = self.generate_assignments(students_df)
-        assignments_df.to_csv(f'{output_dir}/06_assignments.csv', index=False)
         
         print("\n📢 STEP 8: Generating Behavior Reports...")
         behavior_df = self.generate_behavior_reports(students_df)
-        behavior_df.to_csv(f'{output_dir}/07_behavior_reports.csv', index=False)
         
         print("\n📚 STEP 9: Generating Library Usage...")
         library_df = self.generate_library_usage(students_df)
-        library_df.to_csv(f'{output_dir}/08_library_usage.csv', index=False)
         
         print("\n💰 STEP 10: Generating Fee Payments...")
         fee_df = self.generate_fee_payments(students_df, family_df)
-        fee_df.to_csv(f'{output_dir}/09_fee_payments.csv', index=False)
         
         print("\n🎯 STEP 11: Generating Extracurricular Activities...")
         extra_reg_df, extra_details_df, extra_attendance_df = self.generate_extracurricular(students_df)
-        extra_reg_df.to_csv(f'{output_dir}/10_extracurricular_registrations.csv', index=False)
-        extra_details_df.to_csv(f'{output_dir}/11_extracurricular_details.csv', index=False)
-        extra_attendance_df.to_csv(f'{output_dir}/12_extracurricular_attendance.csv', index=False)
-        
-        # STEP 12: Generate teacher credentials and mappings
-        print("\n🔐 STEP 12: Generating Teacher Credentials...")
-        self.generate_teacher_credentials(teachers_df, students_df, output_dir)
-        
-        # Generate summary
-        self.generate_summary_report(output_dir, teachers_df, students_df, family_df, academic_df,
-                                    attendance_df, marks_df, assignments_df, behavior_df, 
-                                    library_df, fee_df, extra_reg_df, extra_details_df, extra_attendance_df)
-        
-        print("\n" + "="*80)
-        print("✅ COMPLETE DATA GENERATION SUCCESSFUL!")
-        print("="*80)
-        print(f"\n📁 Output Directory: {output_dir}")
-        print(f"\n📊 Generated Files:")
-        print(f"   - teachers.csv ({len(teachers_df)} teachers)")
-        print(f"   - 01_students_master.csv ({len(students_df)} students)")
-        print(f"   - 02-12: All supporting data files")
-        print(f"   - teachers.json (login credentials)")
-        print(f"   - student_teacher_mapping.json")
         
         return {
-            'teachers': teachers_df,
-            'students': students_df,
-            'family': family_df,
-            'academic': academic_df
+            '02_family_background': family_df,
+            '03_academic_history': academic_df,
+            '04_daily_attendance': attendance_df,
+            '05_marks_exams': marks_df,
+            '06_assignments': assignments_df,
+            '07_behavior_reports': behavior_df,
+            '08_library_usage': library_df,
+            '09_fee_payments': fee_df,
+            '10_extracurricular_registrations': extra_reg_df,
+            '11_extracurricular_details': extra_details_df,
+            '12_extracurricular_attendance': extra_attendance_df
         }
     
     def generate_teachers(self):
@@ -177,10 +453,11 @@ class CompleteSynchronizedDataGenerator:
             branch_name = branch_info['name']
             
             for year in range(1, 5):  # Years 1-4
-                # 1 Class Coordinator + 2-3 Subject Teachers per year
+                # 1 Class Coordinator + 2-3 Subject Teachers per section
                 num_teachers = 4  # Fixed: 1 coordinator + 3 teachers
                 
-                for i in range(num_teachers):
+                for slot in range(num_teachers * self.sections_per_year):
+                    i = slot % num_teachers
                     first_name = random.choice(self.teacher_first_names)
                     last_name = random.choice(self.last_names)
                     title = random.choice(['Prof.', 'Dr.', 'Mr.', 'Ms.'])
@@ -250,7 +527,7 @@ class CompleteSynchronizedDataGenerator:
             for year_idx, num_students in enumerate(branch_info['students_per_year']):
                 year = year_idx + 1
                 
-                # Get class coordinator for this branch and year
+                # Get class coordinators (one per section) for this branch and year
                 coordinator = teachers_df[
                     (teachers_df['branch'] == branch_code) & 
                     (teachers_df['year'] == year) &
@@ -261,8 +538,8 @@ class CompleteSynchronizedDataGenerator:
                     print(f"⚠️ No coordinator found for {branch_code} Year {year}")
                     continue
                 
-                coordinator_id = coordinator.iloc[0]['teacher_id']
-                coordinator_name = coordinator.iloc[0]['name']
+                coordinator_ids = coordinator['teacher_id'].values
+                coordinator_names = coordinator['name'].values
                 
                 # Distribute students across semesters
                 sem1_count = num_students // 2
@@ -272,6 +549,8 @@ class CompleteSynchronizedDataGenerator:
                     count = sem1_count if semester == 1 else sem2_count
                     
                     for i in range(count):
+                        # Spread students across sections round-robin
+                        section = i % len(coordinator_ids)
                         gender = random.choice(['Male', 'Female'])
                         first_name = random.choice(
                             self.first_names_male if gender == 'Male' else self.first_names_female
@@ -300,8 +579,8 @@ class CompleteSynchronizedDataGenerator:
                             'semester': semester,
                             'admission_date': self.start_date.strftime('%Y-%m-%d'),
                             'status': 'Active',
-                            'primary_teacher_id': int(coordinator_id),
-                            'class_coordinator': coordinator_name
+                            'primary_teacher_id': int(coordinator_ids[section]),
+                            'class_coordinator': coordinator_names[section]
                         }
                         
                         students.append(student)
@@ -534,6 +813,9 @@ class CompleteSynchronizedDataGenerator:
     
     def generate_daily_attendance(self, students_df):
         """Generate daily attendance for past 8 weeks"""
+        if self.vectorized:
+            return self._generate_daily_attendance_vectorized(students_df)
+        
         attendance_records = []
         weeks = 8
 
@@ -572,17 +854,51 @@ class CompleteSynchronizedDataGenerator:
         print(f"✅ Generated {len(df)} attendance records")
         return df
     
+    def _generate_daily_attendance_vectorized(self, students_df):
+        """Vectorized attendance: draws a student x week x day array in one go"""
+        weeks = 8
+        day_names = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'])
+        n = len(students_df)
+        
+        # Same model as the loop version: base rate, Monday/Friday penalty
+        # and a random late-semester decay
+        base_rate = self.rng.uniform(0.65, 0.95, size=(n, 1, 1))
+        day_factor = np.array([0.85, 1.0, 1.0, 1.0, 0.90]).reshape(1, 1, 5)
+        decay = (np.arange(weeks) / weeks * 0.2).reshape(1, weeks, 1)
+        decayed = self.rng.random((n, weeks, 5)) < 0.25
+        prob = base_rate * day_factor - decayed * decay
+        present = self.rng.random((n, weeks, 5)) < prob
+        
+        # Calendar slots shared by every student
+        first_day = self.current_date - timedelta(weeks=weeks)
+        dates = [first_day + timedelta(days=week*7 + day) for week in range(weeks) for day in range(5)]
+        keep = np.array([date <= self.current_date for date in dates])
+        date_str = np.array([date.strftime('%Y-%m-%d') for date in dates])[keep]
+        week_number = np.repeat(np.arange(1, weeks + 1), 5)[keep]
+        day_of_week = np.tile(day_names, weeks)[keep]
+        slots = len(date_str)
+        
+        status = np.where(present.reshape(n, -1)[:, keep], 'Present', 'Absent').ravel()
+        
+        df = pd.DataFrame({
+            'student_id': np.repeat(students_df['student_id'].values, slots),
+            'date': np.tile(date_str, n),
+            'day_of_week': np.tile(day_of_week, n),
+            'week_number': np.tile(week_number, n),
+            'status': status,
+            'marked_by': np.repeat(students_df['class_coordinator'].values, slots),
+            'marked_at': np.tile(np.char.add(date_str, ' 00:00:00'), n)
+        })
+        print(f"✅ Generated {len(df)} attendance records")
+        return df
+    
     def generate_marks_data(self, students_df):
         """Generate marks for exams"""
+        if self.vectorized:
+            return self._generate_marks_data_vectorized(students_df)
+        
         marks_records = []
-        exam_types = [
-            ('Unit Test 1', 20, '2025-09-15'),
-            ('Unit Test 2', 20, '2025-10-20'),
-            ('Mid Semester', 30, '2025-11-10'),
-            ('Assignment 1', 10, '2025-09-30'),
-            ('Assignment 2', 10, '2025-10-30'),
-            ('Lab Internal', 10, '2025-11-20')
-        ]
+        exam_types = self.exam_types
 
         for _, student in students_df.iterrows():
             aptitude = random.uniform(40, 95)
@@ -612,6 +928,38 @@ class CompleteSynchronizedDataGenerator:
         print(f"✅ Generated {len(df)} marks records")
         return df
     
+    def _generate_marks_data_vectorized(self, students_df):
+        """Vectorized marks: draws a student x subject x exam array in one go"""
+        subjects = np.array(self.subjects[:6])
+        exam_names = np.array([name for name, _, _ in self.exam_types])
+        max_marks = np.array([marks for _, marks, _ in self.exam_types], dtype=float)
+        exam_dates = np.array([date for _, _, date in self.exam_types])
+        n, n_subjects, n_exams = len(students_df), len(subjects), len(exam_names)
+        shape = (n, n_subjects, n_exams)
+        
+        aptitude = self.rng.uniform(40, 95, size=(n, 1, 1))
+        performance_factor = self.rng.uniform(0.7, 1.1, size=shape)
+        obtained = aptitude * (max_marks / 100) * performance_factor + self.rng.uniform(-3, 3, size=shape)
+        obtained = np.clip(obtained, 0, max_marks)
+        
+        # Occasional dip in the second unit test and mid semester
+        dip_exam = np.array(['Test 2' in name or 'Mid' in name for name in exam_names])
+        dipped = (self.rng.random(shape) < 0.20) & dip_exam
+        obtained = np.where(dipped, obtained * 0.75, obtained)
+        
+        df = pd.DataFrame({
+            'student_id': np.repeat(students_df['student_id'].values, n_subjects * n_exams),
+            'subject': np.tile(np.repeat(subjects, n_exams), n),
+            'exam_type': np.tile(exam_names, n * n_subjects),
+            'max_marks': np.tile(max_marks.astype(int), n * n_subjects),
+            'obtained_marks': np.round(obtained, 2).ravel(),
+            'percentage': np.round(obtained / max_marks * 100, 2).ravel(),
+            'exam_date': np.tile(exam_dates, n * n_subjects),
+            'evaluator': np.repeat(students_df['class_coordinator'].values, n_subjects * n_exams)
+        })
+        print(f"✅ Generated {len(df)} marks records")
+        return df
+    
     def generate_assignments(self, students_df):
         """Generate assignment submissions"""
         assignment_records = []
@@ -677,7 +1025,7 @@ class CompleteSynchronizedDataGenerator:
             ('Respectful Behavior', 'Positive', 'Shows respect to faculty and peers')
         ]
 
-        students_with_reports = students_df.sample(frac=0.30)
+        students_with_reports = students_df.sample(frac=0.30, random_state=self.rng)
 
         for _, student in students_with_reports.iterrows():
             num_reports = random.randint(1, 3)
@@ -711,7 +1059,7 @@ class CompleteSynchronizedDataGenerator:
             'Digital Electronics', 'Control Systems', 'Power Systems'
         ]
 
-        active_library_users = students_df.sample(frac=0.60)
+        active_library_users = students_df.sample(frac=0.60, random_state=self.rng)
 
         for _, student in active_library_users.iterrows():
             num_visits = random.randint(5, 20)
@@ -792,6 +1140,8 @@ class CompleteSynchronizedDataGenerator:
     
     def generate_extracurricular(self, students_df):
         """Generate extracurricular activities"""
+        if self.vectorized:
+            return self._generate_extracurricular_vectorized(students_df)
         
         # Registrations
         reg_records = []
@@ -947,6 +1297,141 @@ class CompleteSynchronizedDataGenerator:
         
         return reg_df, detail_df, attendance_df
     
+    def _generate_extracurricular_vectorized(self, students_df):
+        """Batched extracurricular: samples all students at once, expands sessions with np.repeat"""
+        rng = self.rng
+        categories = np.array(list(self.clubs_activities.keys()))
+        roles = np.array(['Member', 'Active Member', 'Core Team', 'Coordinator', 'President/Head'])
+        levels = np.array(['Low', 'Medium', 'High', 'Very High'])
+        achievements = np.array([
+            'Winner - Intra College Competition',
+            'Winner - Inter College Competition',
+            'Best Performer Award',
+            'Certificate of Excellence',
+            'Participation Certificate',
+            None
+        ], dtype=object)
+        session_types = np.array(['Regular Meeting', 'Practice Session', 'Workshop',
+                                  'Event', 'Competition', 'Training', 'Project Work'])
+        durations = np.array([1, 1.5, 2, 2.5, 3, 4])
+        
+        student_ids = students_df['student_id'].values
+        coordinators = students_df['class_coordinator'].values
+        n = len(students_df)
+        
+        # Registrations: activity count per participating student
+        participates = rng.random(n) < 0.65
+        num_activities = np.where(
+            participates,
+            rng.choice([1, 2, 3, 4], size=n, p=[0.40, 0.35, 0.20, 0.05]),
+            0
+        )
+        
+        # Details: one row per (student, category), categories sampled without replacement
+        owner = np.repeat(np.arange(n), num_activities)
+        slot = np.arange(len(owner)) - np.repeat(np.cumsum(num_activities) - num_activities, num_activities)
+        category_order = np.argsort(rng.random((n, len(categories))), axis=1)
+        category_idx = category_order[owner, slot]
+        category = categories[category_idx]
+        m = len(owner)
+        
+        # Padded category x club lookup so the club pick is a single fancy index
+        club_counts = np.array([len(self.clubs_activities[c]) for c in categories])
+        club_table = np.empty((len(categories), club_counts.max()), dtype=object)
+        for i, c in enumerate(categories):
+            club_table[i, :club_counts[i]] = self.clubs_activities[c]
+        club_pick = (rng.random(m) * club_counts[category_idx]).astype(int)
+        activity = club_table[category_idx, club_pick]
+        
+        reg_offset = rng.integers(1, 31, size=m)
+        
+        role_idx = rng.choice(len(roles), size=m, p=[0.60, 0.25, 0.10, 0.03, 0.02])
+        member_level = rng.choice(3, size=m, p=[0.40, 0.40, 0.20])
+        level_idx = np.select(
+            [role_idx >= 3, role_idx == 2, role_idx == 1],
+            [3, rng.integers(2, 4, size=m), rng.integers(1, 3, size=m)],
+            default=member_level
+        )
+        
+        hours_low, hours_high = np.array([1, 3, 6, 10]), np.array([3, 6, 10, 15])
+        events_low, events_high = np.array([0, 2, 5, 10]), np.array([2, 5, 10, 20])
+        hours_per_week = rng.integers(hours_low[level_idx], hours_high[level_idx] + 1)
+        events_participated = rng.integers(events_low[level_idx], events_high[level_idx] + 1)
+        
+        has_achievement = rng.random(m) < 0.25
+        achievement = np.where(has_achievement, achievements[rng.integers(0, len(achievements), size=m)], None)
+        active = rng.random(m) < 0.85
+        
+        reg_dates = self._date_strings(self.start_date, 31)
+        detail_df = pd.DataFrame({
+            'student_id': student_ids[owner],
+            'activity_name': activity,
+            'activity_category': category,
+            'registration_date': reg_dates[reg_offset],
+            'role': roles[role_idx],
+            'activity_level': levels[level_idx],
+            'hours_per_week': hours_per_week,
+            'total_events_participated': events_participated,
+            'achievement': achievement,
+            'status': np.where(active, 'Active', 'Inactive'),
+            'faculty_coordinator': coordinators[owner]
+        })
+        
+        # Earliest registration date per participating student
+        first_offset = np.full(n, -1)
+        if m:
+            starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+            first_offset[owner[starts]] = np.minimum.reduceat(reg_offset, starts)
+        reg_df = pd.DataFrame({
+            'student_id': student_ids,
+            'total_activities': num_activities,
+            'participation_status': np.where(participates, 'Active', 'Not Participating'),
+            'registration_date': np.where(participates, reg_dates[np.maximum(first_offset, 0)], None)
+        })
+        
+        # Sessions: expand every active registration into months x sessions_per_month
+        months = 4
+        sessions_per_month = np.select(
+            [np.isin(category, ['Technical', 'Academic']), category == 'Sports', category == 'Cultural'],
+            [4, 14, 6],
+            default=4
+        )
+        session_counts = np.where(active, months * sessions_per_month, 0)
+        parent = np.repeat(np.arange(m), session_counts)
+        k = len(parent)
+        position = np.arange(k) - np.repeat(np.cumsum(session_counts) - session_counts, session_counts)
+        month = position // sessions_per_month[parent]
+        days_offset = month * 30 + rng.integers(0, 31, size=k)
+        in_range = days_offset <= (self.current_date - self.start_date).days
+        
+        attendance_prob = np.array([0.50, 0.70, 0.85, 0.95])[level_idx[parent]]
+        attended = rng.random(k) < attendance_prob
+        session_type = session_types[rng.integers(0, len(session_types), size=k)]
+        session_time = np.char.add(rng.integers(14, 19, size=k).astype(str), ':00:00')
+        duration_hours = durations[rng.integers(0, len(durations), size=k)]
+        
+        session_dates = self._date_strings(self.start_date, months * 30 + 31)
+        attendance_df = pd.DataFrame({
+            'student_id': student_ids[owner[parent]],
+            'activity_name': activity[parent],
+            'session_date': session_dates[days_offset],
+            'session_type': session_type,
+            'session_time': session_time,
+            'duration_hours': duration_hours,
+            'attendance_status': np.where(attended, 'Present', 'Absent'),
+            'marked_by': coordinators[owner[parent]]
+        })[in_range].reset_index(drop=True)
+        
+        print(f"✅ Generated {len(reg_df)} extracurricular registrations")
+        print(f"✅ Generated {len(detail_df)} extracurricular details")
+        print(f"✅ Generated {len(attendance_df)} extracurricular attendance records")
+        
+        return reg_df, detail_df, attendance_df
+    
+    def _date_strings(self, start, num_days):
+        """Lookup table of 'YYYY-MM-DD' strings for start + 0..num_days-1 days"""
+        return np.array([(start + timedelta(days=d)).strftime('%Y-%m-%d') for d in range(num_days)])
+    
     def generate_teacher_credentials(self, teachers_df, students_df, output_dir):
         """Generate teacher credentials and student mappings"""
         
@@ -1115,9 +1600,207 @@ Total Attendance Records: {len(extra_attendance_df)}
         print("\n" + summary)
 
 
+def generate_benchmark_tiers(tiers=None, base_dir='data/benchmark', seed=42, vectorized=True,
+                             output_format='csv', max_workers=None):
+    """
+    Generate named scale-factor datasets, each under {base_dir}/{tier}/dummy_data
+    
+    Tiers below SHARDED_TIER_MIN_SCALE_FACTOR are generated in memory; larger ones
+    go through generate_sharded in fixed-size student blocks and are combined into
+    the usual single CSV per table. Sharded parts are CSV, so those tiers cannot
+    be written as Parquet.
+    """
+    tiers = tiers or list(BENCHMARK_TIERS)
+    sharded = [tier for tier in tiers if BENCHMARK_TIERS[tier] >= SHARDED_TIER_MIN_SCALE_FACTOR]
+    if sharded and output_format != 'csv':
+        raise ValueError(f"Tiers {sharded} are generated sharded and written as CSV; "
+                         f"output_format={output_format!r} is only supported below "
+                         f"scale factor {SHARDED_TIER_MIN_SCALE_FACTOR}")
+    output_dirs = {}
+    
+    for tier in tiers:
+        print(f"\n🏗️ Generating benchmark tier {tier} (scale factor {BENCHMARK_TIERS[tier]})...")
+        output_dir = os.path.join(base_dir, tier, 'dummy_data')
+        if tier in sharded:
+            generate_sharded(output_dir, seed=seed, scale_factor=BENCHMARK_TIERS[tier], vectorized=vectorized,
+                             block_size=SHARDED_TIER_BLOCK_SIZE, max_workers=max_workers, combine=True)
+        else:
+            generator = CompleteSynchronizedDataGenerator(
+                seed=seed, vectorized=vectorized, scale_factor=BENCHMARK_TIERS[tier]
+            )
+            generator.generate_all_data(output_dir=output_dir, output_format=output_format)
+        output_dirs[tier] = output_dir
+    
+    return output_dirs
+
+
+def shard_students(students_df, block_size=None):
+    """Split students into shards: one per branch/year, or fixed-size blocks in student order"""
+    if block_size:
+        return [(f'block-{start // block_size:05d}', students_df.iloc[start:start + block_size])
+                for start in range(0, len(students_df), block_size)]
+    
+    return [(f'{branch}-Y{year}', group)
+            for (branch, year), group in students_df.groupby(['branch', 'year'], sort=False)]
+
+
+def _generate_shard(task):
+    """Process-pool worker: generate tables 02-12 for one shard and write its part files"""
+    shard_index, shard_seed, students_df, output_dir, vectorized = task
+    generator = CompleteSynchronizedDataGenerator(seed=shard_seed, vectorized=vectorized)
+    
+    part_files = {}
+    for table_name, df in generator.generate_student_tables(students_df).items():
+        part_path = os.path.join('parts', table_name, f'part-{shard_index:05d}.csv')
+        os.makedirs(os.path.join(output_dir, os.path.dirname(part_path)), exist_ok=True)
+        df.to_csv(os.path.join(output_dir, part_path), index=False)
+        part_files[table_name] = {'path': part_path, 'rows': len(df)}
+    
+    return part_files
+
+
+def generate_sharded(output_dir='data/dummy_data', seed=42, scale_factor=1, vectorized=True,
+                     block_size=None, max_workers=None, combine=False):
+    """
+    Generate the dataset in shards across a process pool
+    
+    Teachers and the student roster are generated once; every shard then gets its own
+    seed derived from `seed` (numpy SeedSequence), so the part files are byte-for-byte
+    reproducible no matter how many workers run them. manifest.json ties the parts together.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    generator = CompleteSynchronizedDataGenerator(seed=seed, vectorized=vectorized, scale_factor=scale_factor)
+    
+    print("\n📚 STEP 1: Generating Teachers...")
+    teachers_df = generator.generate_teachers()
+    teachers_df.to_csv(f'{output_dir}/teachers.csv', index=False)
+    
+    print("\n👨‍🎓 STEP 2: Generating Students...")
+    students_df = generator.generate_students(teachers_df)
+    students_df.to_csv(f'{output_dir}/01_students_master.csv', index=False)
+    
+    generator.generate_teacher_credentials(teachers_df, students_df, output_dir)
+    
+    # One derived seed per shard, stable for a given (seed, sharding)
+    shards = shard_students(students_df, block_size)
+    shard_seeds = [int(child.generate_state(1)[0])
+                   for child in np.random.SeedSequence(seed).spawn(len(shards))]
+    
+    print(f"\n⚙️ Generating {len(shards)} shards across {max_workers or os.cpu_count()} processes...")
+    tasks = [(i, shard_seeds[i], shard_df, output_dir, vectorized) for i, (_, shard_df) in enumerate(shards)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        shard_parts = list(executor.map(_generate_shard, tasks))
+    
+    manifest = {
+        'seed': seed,
+        'scale_factor': scale_factor,
+        'vectorized': vectorized,
+        'sharding': f'block:{block_size}' if block_size else 'branch_year',
+        'shards': [
+            {
+                'index': i,
+                'key': key,
+                'seed': shard_seeds[i],
+                'students': len(shard_df),
+                'first_student_id': int(shard_df['student_id'].iloc[0]),
+                'last_student_id': int(shard_df['student_id'].iloc[-1])
+            }
+            for i, (key, shard_df) in enumerate(shards)
+        ],
+        'tables': {
+            'teachers': {'files': ['teachers.csv'], 'rows': len(teachers_df)},
+            '01_students_master': {'files': ['01_students_master.csv'], 'rows': len(students_df)}
+        }
+    }
+    for table_name in shard_parts[0]:
+        manifest['tables'][table_name] = {
+            'files': [parts[table_name]['path'] for parts in shard_parts],
+            'rows': sum(parts[table_name]['rows'] for parts in shard_parts)
+        }
+    
+    with open(f'{output_dir}/manifest.json', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    print(f"✅ Wrote {len(shards)} shards and manifest: {output_dir}/manifest.json")
+    
+    if combine:
+        combine_shards(output_dir)
+    
+    return manifest
+
+
+def combine_shards(output_dir):
+    """Concatenate the part files listed in manifest.json into the usual single CSV per table"""
+    with open(f'{output_dir}/manifest.json') as f:
+        manifest = json.load(f)
+    
+    for table_name, table in manifest['tables'].items():
+        parts = table['files']
+        if len(parts) == 1 and parts[0] == f'{table_name}.csv':
+            continue
+        
+        header_written = False
+        with open(f'{output_dir}/{table_name}.csv', 'wb') as out:
+            for part in parts:
+                with open(os.path.join(output_dir, part), 'rb') as src:
+                    header = src.readline()
+                    # Empty shards (e.g. no behavior reports) have no usable header
+                    if header.strip() and not header_written:
+                        out.write(header)
+                        header_written = True
+                    shutil.copyfileobj(src, out)
+    
+    print(f"✅ Combined shard parts into {output_dir}/*.csv")
+
+
 if __name__ == "__main__":
-    generator = CompleteSynchronizedDataGenerator()
-    generator.generate_all_data()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Generate synchronized college dataset')
+    parser.add_argument('--output-dir', default='data/dummy_data')
+    parser.add_argument('--seed', type=int, default=None, help='RNG seed for reproducible output')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help='Output format for the 12 tables')
+    parser.add_argument('--vectorized', action='store_true', help='Use NumPy engine for attendance, marks and extracurricular')
+    parser.add_argument('--scale-factor', type=float, default=1, help='Multiply cohort sizes and teacher counts')
+    parser.add_argument('--tier', action='append', choices=list(BENCHMARK_TIERS),
+                        help='Generate a named benchmark tier under data/benchmark (repeatable; '
+                             'the tier sets the scale factor)')
+    parser.add_argument('--sharded', action='store_true', help='Generate shards across a process pool')
+    parser.add_argument('--workers', type=int, default=None, help='Process pool size for --sharded')
+    parser.add_argument('--block-size', type=int, default=None,
+                        help='Shard into fixed-size student blocks instead of branch/year')
+    parser.add_argument('--combine', action='store_true', help='Also concatenate shard parts into single CSVs')
+    parser.add_argument('--stream', action='store_true', help='Write output in student chunks with bounded memory')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Students per chunk for --stream')
+    parser.add_argument('--compression', choices=['gzip', 'zstd'], default=None,
+                        help='Compress --stream output files')
+    parser.add_argument('--sqlite', metavar='DB_PATH', default=None,
+                        help='Write raw tables directly into this SQLite database')
+    args = parser.parse_args()
+    if args.tier and args.scale_factor != 1:
+        parser.error('--scale-factor cannot be combined with --tier (each tier has a fixed scale factor)')
+    
+    if args.sqlite:
+        generator = CompleteSynchronizedDataGenerator(seed=args.seed, vectorized=args.vectorized,
+                                                      scale_factor=args.scale_factor)
+        generator.generate_to_sqlite(args.sqlite, chunk_size=args.chunk_size)
+    elif args.stream:
+        generator = CompleteSynchronizedDataGenerator(seed=args.seed, vectorized=args.vectorized,
+                                                      scale_factor=args.scale_factor)
+        generator.generate_all_data_streaming(args.output_dir, chunk_size=args.chunk_size,
+                                              compression=args.compression)
+    elif args.sharded:
+        generate_sharded(args.output_dir, seed=args.seed if args.seed is not None else 42,
+                         scale_factor=args.scale_factor, vectorized=True, block_size=args.block_size,
+                         max_workers=args.workers, combine=args.combine)
+    elif args.tier:
+        generate_benchmark_tiers(args.tier, seed=args.seed if args.seed is not None else 42,
+                                 vectorized=True, output_format=args.format, max_workers=args.workers)
+    else:
+        generator = CompleteSynchronizedDataGenerator(seed=args.seed, vectorized=args.vectorized,
+                                                      scale_factor=args.scale_factor)
+        generator.generate_all_data(output_dir=args.output_dir, output_format=args.format)
     
     print("\n🎉 SUCCESS! Run the ML pipeline next:")
     print("   python src/run_complete_pipeline.py")
\ No newline at end of file
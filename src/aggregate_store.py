@@ -0,0 +1,172 @@
+"""
+INCREMENTAL AGGREGATE STORE
+Keeps per-student running state for the transactional tables and folds in
+only the rows appended since the last refresh (tracked by a watermark)
+"""
+
+import os
+import io
+import hashlib
+import pandas as pd
+
+from data_loader import CSV_ENGINE, CODE_FILES, FEATURE_VERSION
+from table_schemas import read_options
+
+
+# Feature frame -> source table and the DataLoader partial/finalize methods for it
+INCREMENTAL_AGGREGATES = {
+    'attendance': {
+        'table': '04_daily_attendance',
+        'partials': '_attendance_partials',
+        'finalize': '_finalize_attendance'
+    },
+    'marks': {
+        'table': '05_marks_exams',
+        'partials': '_marks_partials',
+        'finalize': '_finalize_marks',
+        'min_cols': ('pct_min',),
+        'max_cols': ('pct_max',)
+    },
+    'assignments': {
+        'table': '06_assignments',
+        'partials': '_assignment_partials',
+        'finalize': '_finalize_assignments'
+    },
+    'library': {
+        'table': '08_library_usage',
+        'partials': '_library_partials',
+        'finalize': '_finalize_library'
+    },
+    'fees': {
+        'table': '09_fee_payments',
+        'partials': '_fee_partials',
+        'finalize': '_finalize_fees'
+    }
+}
+
+# Bytes before the watermark that must be unchanged for appended rows to be trusted
+TAIL_CHECK_BYTES = 4096
+
+
+class IncrementalAggregateStore:
+    """
+    Running per-student state (counts, sums, sums of squares, min/max, trend
+    window day counts) for attendance, marks, assignments, library and fees
+    
+    Tables are treated as append-only. Plain CSVs are read from the recorded
+    byte offset, so a refresh costs as much as the new rows. Compressed CSV and
+    Parquet are re-read but only rows past the recorded row count are folded in.
+    A rewritten or truncated table, or a change to the loader code, rebuilds
+    that table's state from scratch.
+    """
+    
+    def __init__(self, loader, store_dir='data/aggregate_store'):
+        self.loader = loader
+        self.store_dir = store_dir
+        self.code_version = [loader._file_digest(path) for path in CODE_FILES] + [FEATURE_VERSION]
+    
+    def aggregate(self, name):
+        """Bring one feature frame's state up to date and return the finalized aggregate"""
+        spec = INCREMENTAL_AGGREGATES[name]
+        state, watermark = self._load(name)
+        
+        new_rows, new_watermark, reset = self._read_new_rows(spec['table'], watermark)
+        if reset:
+            state = None
+        
+        if len(new_rows) or state is None:
+            partial = getattr(self.loader, spec['partials'])(new_rows)
+            state = self.loader._merge_partials(state, partial,
+                                                spec.get('min_cols', ()), spec.get('max_cols', ()))
+            self._save(name, state, new_watermark)
+        
+        print(f"   {name}: {'rebuilt from' if reset else 'applied'} {len(new_rows)} rows "
+              f"(watermark {new_watermark['rows']} rows)")
+        return getattr(self.loader, spec['finalize'])(state)
+    
+    def refresh(self):
+        """Update every incremental aggregate; returns {name: aggregate frame}"""
+        return {name: self.aggregate(name) for name in INCREMENTAL_AGGREGATES}
+    
+    def _read_new_rows(self, table_name, watermark):
+        """Rows appended since the watermark, the new watermark, and whether state must reset"""
+        path, ext = self.loader._table_path(table_name)
+        reset = (watermark is None or watermark['code_version'] != self.code_version
+                 or watermark['file'] != os.path.basename(path))
+        
+        if ext == '.csv':
+            return self._read_csv_tail(table_name, path, None if reset else watermark)
+        
+        df = self.loader._read_table(table_name)
+        if not reset and len(df) < watermark['rows']:
+            reset = True
+        start = 0 if reset else watermark['rows']
+        return df.iloc[start:], self._watermark(path, len(df)), reset
+    
+    def _read_csv_tail(self, table_name, path, watermark):
+        """Parse only the bytes of a plain CSV past the watermark's offset"""
+        usecols, dtype = read_options(table_name)
+        with open(path, 'rb') as f:
+            header = f.readline()
+            # Resume only if the bytes just before the old offset are unchanged
+            reset = watermark is None or self._tail_digest(f, watermark['offset']) != watermark['tail_digest']
+            offset = len(header) if reset else watermark['offset']
+            f.seek(offset)
+            tail = f.read()
+        
+        # Ignore a partially written last line; it is picked up next time
+        tail = tail[:tail.rfind(b'\n') + 1]
+        new_offset = offset + len(tail)
+        
+        if tail:
+            new_rows = pd.read_csv(io.BytesIO(header + tail), usecols=usecols, dtype=dtype, engine=CSV_ENGINE)
+        else:
+            new_rows = pd.read_csv(io.BytesIO(header), usecols=usecols, dtype=dtype)
+        
+        rows = len(new_rows) + (0 if reset else watermark['rows'])
+        with open(path, 'rb') as f:
+            tail_digest = self._tail_digest(f, new_offset)
+        
+        new_watermark = self._watermark(path, rows, offset=new_offset, tail_digest=tail_digest)
+        return new_rows, new_watermark, reset
+    
+    def _tail_digest(self, f, offset):
+        """sha256 of the TAIL_CHECK_BYTES bytes ending at offset"""
+        f.seek(max(offset - TAIL_CHECK_BYTES, 0))
+        return hashlib.sha256(f.read(min(offset, TAIL_CHECK_BYTES))).hexdigest()
+    
+    def _watermark(self, path, rows, **extra):
+        return {'file': os.path.basename(path), 'rows': rows, 'code_version': self.code_version, **extra}
+    
+    def _path(self, name):
+        return os.path.join(self.store_dir, f'{name}.pkl')
+    
+    def _load(self, name):
+        """Stored state and watermark for one aggregate, or (None, None)"""
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None, None
+        stored = pd.read_pickle(path)
+        return stored['state'], stored['watermark']
+    
+    def _save(self, name, state, watermark):
+        """State and watermark go in one file, replaced atomically, so they can never disagree"""
+        os.makedirs(self.store_dir, exist_ok=True)
+        path = self._path(name)
+        pd.to_pickle({'state': state, 'watermark': watermark}, f'{path}.tmp')
+        os.replace(f'{path}.tmp', path)
+
+
+if __name__ == "__main__":
+    import argparse
+    from data_loader import DataLoader
+    
+    parser = argparse.ArgumentParser(description='Refresh the incremental per-student aggregates')
+    parser.add_argument('--data-dir', default='data/dummy_data')
+    parser.add_argument('--store-dir', default='data/aggregate_store')
+    args = parser.parse_args()
+    
+    print("🔄 Refreshing incremental aggregates...")
+    store = IncrementalAggregateStore(DataLoader(data_dir=args.data_dir), args.store_dir)
+    aggregates = store.refresh()
+    print(f"✅ Refreshed {len(aggregates)} aggregates in {args.store_dir}")
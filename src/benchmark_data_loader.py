@@ -0,0 +1,132 @@
+"""
+DATA LOADER BENCHMARK
+Times the DataLoader aggregation steps on synthetic datasets of growing size,
+and compares untyped vs typed (schema, usecols, pyarrow engine) table reads
+"""
+
+import os
+import sys
+import io
+import time
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from generate_complete_synchronized_data import CompleteSynchronizedDataGenerator
+from data_loader import DataLoader, CSV_ENGINE
+from table_schemas import TABLE_SCHEMAS
+
+
+def build_tables(scale_factor, seed=42):
+    """Generate all 12 tables in memory at the given scale factor"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = CompleteSynchronizedDataGenerator(seed=seed, vectorized=True, scale_factor=scale_factor)
+        teachers_df = generator.generate_teachers()
+        students_df = generator.generate_students(teachers_df)
+        tables = generator.generate_student_tables(students_df)
+    tables['01_students_master'] = students_df
+    return tables
+
+
+def time_aggregations(tables, repeats=3):
+    """Best-of-N wall time (seconds) for each DataLoader aggregation"""
+    loader = DataLoader()
+    steps = {
+        'attendance': lambda: loader._aggregate_attendance(tables['04_daily_attendance']),
+        'marks': lambda: loader._aggregate_marks(tables['05_marks_exams']),
+        'assignments': lambda: loader._aggregate_assignments(tables['06_assignments']),
+        'behavior': lambda: loader._aggregate_behavior(tables['07_behavior_reports']),
+        'library': lambda: loader._aggregate_library(tables['08_library_usage']),
+        'fees': lambda: loader._aggregate_fees(tables['09_fee_payments']),
+        'extracurricular': lambda: loader._aggregate_extracurricular(
+            tables['10_extracurricular_registrations'],
+            tables['11_extracurricular_details'],
+            tables['12_extracurricular_attendance']
+        )
+    }
+    
+    timings = {}
+    for name, step in steps.items():
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            step()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+    return timings
+
+
+def run_benchmark(scale_factors=(1, 5, 10, 25), repeats=3):
+    """Print and return aggregation timings per scale factor"""
+    print("="*80)
+    print("⏱️ DATA LOADER AGGREGATION BENCHMARK")
+    print("="*80)
+    
+    rows = []
+    for scale_factor in scale_factors:
+        tables = build_tables(scale_factor)
+        students = len(tables['01_students_master'])
+        timings = time_aggregations(tables, repeats)
+        total = sum(timings.values())
+        rows.append({
+            'scale_factor': scale_factor,
+            'students': students,
+            **{f'{name}_s': round(t, 4) for name, t in timings.items()},
+            'total_s': round(total, 4),
+            'ms_per_1k_students': round(total / students * 1e6, 2)
+        })
+        print(f"   sf={scale_factor}: {students} students, {total:.3f}s")
+    
+    results = pd.DataFrame(rows)
+    print("\n" + results.to_string(index=False))
+    return results
+
+
+def benchmark_reads(data_dir='data/dummy_data', repeats=3):
+    """Parse time and memory per table: plain pd.read_csv vs DataLoader._read_table"""
+    print("="*80)
+    print(f"⏱️ TABLE READ BENCHMARK ({data_dir}, typed engine: {CSV_ENGINE})")
+    print("="*80)
+    
+    loader = DataLoader(data_dir=data_dir)
+    rows = []
+    for table_name in TABLE_SCHEMAS:
+        path, _ = loader._table_path(table_name)
+        readers = {
+            'before': lambda: pd.read_csv(path),
+            'after': lambda: loader._read_table(table_name)
+        }
+        
+        row = {'table': table_name}
+        for label, read in readers.items():
+            best = float('inf')
+            for _ in range(repeats):
+                start = time.perf_counter()
+                df = read()
+                best = min(best, time.perf_counter() - start)
+            row[f'{label}_ms'] = round(best * 1000, 1)
+            row[f'{label}_mb'] = round(df.memory_usage(deep=True).sum() / 2**20, 2)
+        rows.append(row)
+    
+    results = pd.DataFrame(rows)
+    totals = results.drop(columns='table').sum()
+    print("\n" + results.to_string(index=False))
+    print(f"\nTotal parse: {totals['before_ms']:.1f} ms -> {totals['after_ms']:.1f} ms, "
+          f"memory: {totals['before_mb']:.2f} MB -> {totals['after_mb']:.2f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Benchmark DataLoader aggregations')
+    parser.add_argument('--scale-factors', type=float, nargs='+', default=[1, 5, 10, 25])
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--reads', metavar='DATA_DIR', default=None,
+                        help='Benchmark untyped vs typed table reads in DATA_DIR instead')
+    args = parser.parse_args()
+    
+    if args.reads:
+        benchmark_reads(args.reads, args.repeats)
+    else:
+        run_benchmark(args.scale_factors, args.repeats)
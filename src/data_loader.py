@@ -1,17 +1,105 @@
 """
 DATA LOADER - Load and merge all CSV files
 Handles missing values and creates master dataset
+Reads Parquet or (optionally compressed) CSV, whichever is present
 """
 
 import pandas as pd
 import numpy as np
 import os
+import json
+import hashlib
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from table_schemas import TABLE_SCHEMAS, read_options, to_pipeline_dtypes
+
+# Multithreaded pyarrow CSV parser when available
+try:
+    import pyarrow
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+
+# Date column used for trailing windows (and as_of filtering) of the time-series tables
+WINDOW_DATE_COLUMNS = {'04_daily_attendance': 'date', '05_marks_exams': 'exam_date'}
+
+# Date from which each event table's rows are known; as_of drops rows dated later.
+# Assignments and fees enter a snapshot once they fall due. Family background
+# and academic history are per-student profiles with no event date.
+AS_OF_DATE_COLUMNS = {
+    **WINDOW_DATE_COLUMNS,
+    '06_assignments': 'due_date',
+    '07_behavior_reports': 'report_date',
+    '08_library_usage': 'visit_date',
+    '09_fee_payments': 'due_date',
+    '10_extracurricular_registrations': 'registration_date',
+    '11_extracurricular_details': 'registration_date',
+    '12_extracurricular_attendance': 'session_date'
+}
+
+POOL_EXECUTORS = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+
+# Bump when the features produced by load_all_data change in a way the
+# source hash below would not catch (e.g. a dependency upgrade)
+FEATURE_VERSION = 1
+
+# Cached master datasets kept in cache_dir (least recently used ones are deleted)
+CACHE_MAX_ENTRIES = 3
+
+# Source files whose contents determine the master dataset
+CODE_FILES = [
+    os.path.abspath(__file__),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'table_schemas.py')
+]
+
+
+# Checked in order: typed Parquet first, then plain/compressed CSV
+TABLE_EXTENSIONS = ['.parquet', '.csv', '.csv.gz', '.csv.zst']
 
 
 class DataLoader:
-    def __init__(self, data_dir='data/dummy_data'):
+    def __init__(self, data_dir='data/dummy_data', chunksize=None, max_workers=None, executor='thread',
+                 cache_dir=None, fingerprint='stat', incremental_dir=None, sql_backend=None,
+                 as_of=None, windows=None):
         self.data_dir = data_dir
+        # When set, attendance and marks are aggregated out-of-core in chunks of this many rows
+        self.chunksize = chunksize
+        # Pool used to load and aggregate the tables concurrently ('thread' or 'process')
+        if executor not in POOL_EXECUTORS:
+            raise ValueError(f"Unknown executor {executor!r}, expected one of {list(POOL_EXECUTORS)}")
+        self.max_workers = max_workers
+        self.executor = executor
+        # When set, the master dataset is cached there keyed by an input fingerprint:
+        # 'stat' (size + mtime of each table file) or 'hash' (file contents)
+        if fingerprint not in ('stat', 'hash'):
+            raise ValueError(f"Unknown fingerprint {fingerprint!r}, expected 'stat' or 'hash'")
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint
+        self.cache_hit = False
+        # Input fingerprint of the last load_all_data() (set when cache_dir is)
+        self.cache_key = None
+        # When set, attendance, marks, assignments, library and fees come from the
+        # incremental aggregate store there (only rows added since the last run are read)
+        self.incremental_dir = incremental_dir
+        # When set ('sqlite:<db_path>' or 'duckdb'), every table is read and aggregated
+        # by that SQL engine and only per-student results reach pandas
+        self.sql_backend = sql_backend
+        # Point-in-time snapshot: rows of the event tables (AS_OF_DATE_COLUMNS) dated
+        # after as_of are ignored, and
+        # `windows` (in weeks, e.g. [2, 4, 8]) add trailing-window features ending at
+        # as_of (today when only windows are given)
+        self.windows = sorted(set(windows)) if windows else []
+        if any(not isinstance(weeks, (int, np.integer)) or weeks <= 0 for weeks in self.windows):
+            raise ValueError(f"windows must be positive whole weeks, got {windows!r}")
+        if as_of is not None or self.windows:
+            self.as_of = pd.Timestamp(as_of if as_of is not None else datetime.today()).normalize()
+        else:
+            self.as_of = None
+        if self.as_of is not None and (incremental_dir or sql_backend):
+            raise ValueError("as_of/windows are only supported by the pandas (in-memory or chunked) path")
         
     def load_all_data(self):
         """Load and merge all CSV files"""
@@ -19,53 +107,56 @@ class DataLoader:
         print("📊 LOADING ALL DATA FILES")
         print("="*80)
         
-        # 1. Load base tables
-        students = pd.read_csv(f'{self.data_dir}/01_students_master.csv')
-        family = pd.read_csv(f'{self.data_dir}/02_family_background.csv')
-        academic = pd.read_csv(f'{self.data_dir}/03_academic_history.csv')
-        attendance = pd.read_csv(f'{self.data_dir}/04_daily_attendance.csv')
-        marks = pd.read_csv(f'{self.data_dir}/05_marks_exams.csv')
-        assignments = pd.read_csv(f'{self.data_dir}/06_assignments.csv')
-        behavior = pd.read_csv(f'{self.data_dir}/07_behavior_reports.csv')
-        library = pd.read_csv(f'{self.data_dir}/08_library_usage.csv')
-        fees = pd.read_csv(f'{self.data_dir}/09_fee_payments.csv')
-        extra_reg = pd.read_csv(f'{self.data_dir}/10_extracurricular_registrations.csv')
-        extra_details = pd.read_csv(f'{self.data_dir}/11_extracurricular_details.csv')
-        extra_attendance = pd.read_csv(f'{self.data_dir}/12_extracurricular_attendance.csv')
+        self.cache_hit = False
+        if self.cache_dir:
+            self.cache_key = self._cache_key()
+            cache_path = self._cache_path()
+            if os.path.exists(cache_path):
+                master_df = pd.read_pickle(cache_path)
+                # Mark the entry as recently used, so pruning keeps it
+                os.utime(cache_path)
+                self.cache_hit = True
+                print(f"⚡ Loaded cached master dataset: {master_df.shape} ({cache_path})")
+                return master_df
         
-        print(f"✅ Loaded {len(students)} students")
+        master_df = self._build_master()
         
-        # 2. Aggregate features from transactional tables
-        print("\n🔄 Aggregating features...")
+        if self.cache_dir:
+            self._store_cache(master_df, cache_path)
         
-        # Attendance metrics
-        attendance_agg = self._aggregate_attendance(attendance)
-        
-        # Marks metrics
-        marks_agg = self._aggregate_marks(marks)
-        
-        # Assignment metrics
-        assignment_agg = self._aggregate_assignments(assignments)
-        
-        # Behavior metrics
-        behavior_agg = self._aggregate_behavior(behavior)
-        
-        # Library metrics
-        library_agg = self._aggregate_library(library)
-        
-        # Fee metrics
-        fee_agg = self._aggregate_fees(fees)
-        
-        # Extracurricular metrics
-        extra_agg = self._aggregate_extracurricular(extra_reg, extra_details, extra_attendance)
+        return master_df
+    
+    def _build_master(self):
+        """Read, aggregate and merge all tables into the master dataset"""
+        # 1-2. Read every table and aggregate it concurrently: each feature frame
+        # depends only on its own table(s), so wall time follows the largest one
+        if self.sql_backend:
+            from sql_backend import make_backend
+            backend = make_backend(self, self.sql_backend)
+            read_base, tasks = backend.read_table, self._sql_feature_tasks(backend)
+        else:
+            read_base, tasks = self._read_table, self._feature_tasks()
+        
+        with self._executor() as pool:
+            students_future = pool.submit(read_base, '01_students_master')
+            futures = {name: pool.submit(fn, *args) for name, (fn, args) in tasks.items()}
+            
+            students = students_future.result()
+            print(f"✅ Loaded {len(students)} students")
+            
+            print(f"\n🔄 Aggregating features ({len(tasks)} tasks, {self.executor} pool)...")
+            if self.chunksize:
+                print(f"   Streaming attendance and marks in chunks of {self.chunksize} rows")
+            feature_frames = [futures[name].result() for name in tasks]
         
-        # 3. Merge everything
+        # 3. Merge everything: aggregates are indexed by student_id, so one
+        # index-aligned join replaces a chain of copying merges
         print("\n🔗 Merging all features...")
-        master_df = students.copy()
+        master_df = self._join_features(students, feature_frames)
         
-        for df_to_merge in [family, academic, attendance_agg, marks_agg, assignment_agg, 
-                           behavior_agg, library_agg, fee_agg, extra_agg]:
-            master_df = master_df.merge(df_to_merge, on='student_id', how='left')
+        # Typed (Parquet) sources carry compact dtypes; widen them so the
+        # master frame looks the same whichever format was loaded
+        master_df = to_pipeline_dtypes(master_df)
         
         print(f"✅ Master dataset created: {master_df.shape}")
         
@@ -77,87 +168,427 @@ class DataLoader:
         
         return master_df
     
+    def _input_fingerprints(self):
+        """Per table: file name and contents digest ('hash') or size and mtime ('stat')"""
+        inputs = {}
+        for table_name in TABLE_SCHEMAS:
+            path, _ = self._table_path(table_name)
+            if self.fingerprint == 'hash':
+                inputs[table_name] = [os.path.basename(path), self._file_digest(path)]
+            else:
+                stat = os.stat(path)
+                inputs[table_name] = [os.path.basename(path), stat.st_size, stat.st_mtime_ns]
+        return inputs
+    
+    def _cache_key(self):
+        """Fingerprint of the input tables, the loader code and FEATURE_VERSION"""
+        key = {
+            'data_dir': os.path.abspath(self.data_dir),
+            'inputs': self._input_fingerprints(),
+            'code': [self._file_digest(path) for path in CODE_FILES],
+            'feature_version': FEATURE_VERSION,
+            'as_of': None if self.as_of is None else str(self.as_of.date()),
+            'windows': self.windows
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    
+    def _file_digest(self, path):
+        """sha256 of a file, read in 1 MB blocks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _cache_path(self):
+        return os.path.join(self.cache_dir, f'master_{self.cache_key[:24]}.pkl')
+    
+    def _store_cache(self, master_df, cache_path):
+        """Pickle the master frame (keeps dtypes exactly) via a temp file so readers never see a partial write"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f'{cache_path}.tmp'
+        master_df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+        print(f"💾 Cached master dataset: {cache_path}")
+        self._prune_cache()
+    
+    def _prune_cache(self):
+        """Delete all but the CACHE_MAX_ENTRIES most recently used cached master datasets"""
+        entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                   if name.startswith('master_') and name.endswith('.pkl')]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[CACHE_MAX_ENTRIES:]:
+            os.remove(path)
+    
+    def _executor(self):
+        """Pool for the per-table load/aggregate tasks"""
+        return POOL_EXECUTORS[self.executor](max_workers=self.max_workers)
+    
+    def _feature_tasks(self):
+        """(callable, args) per feature frame, in the order they are joined onto students"""
+        if self.chunksize:
+            attendance = (self._aggregate_attendance_chunked, ())
+            marks = (self._aggregate_marks_chunked, ())
+        else:
+            attendance = (self._read_and_aggregate, ('_aggregate_attendance', '04_daily_attendance'))
+            marks = (self._read_and_aggregate, ('_aggregate_marks', '05_marks_exams'))
+        
+        tasks = {
+            'family': (self._read_indexed, ('02_family_background',)),
+            'academic': (self._read_indexed, ('03_academic_history',)),
+            'attendance': attendance,
+            'marks': marks,
+            'assignments': (self._read_and_aggregate, ('_aggregate_assignments', '06_assignments')),
+            'behavior': (self._read_and_aggregate, ('_aggregate_behavior', '07_behavior_reports')),
+            'library': (self._read_and_aggregate, ('_aggregate_library', '08_library_usage')),
+            'fees': (self._read_and_aggregate, ('_aggregate_fees', '09_fee_payments')),
+            'extracurricular': (self._read_and_aggregate, (
+                '_aggregate_extracurricular', '10_extracurricular_registrations',
+                '11_extracurricular_details', '12_extracurricular_attendance'
+            ))
+        }
+        
+        if self.incremental_dir:
+            from aggregate_store import IncrementalAggregateStore, INCREMENTAL_AGGREGATES
+            store = IncrementalAggregateStore(self, self.incremental_dir)
+            for name in INCREMENTAL_AGGREGATES:
+                tasks[name] = (store.aggregate, (name,))
+        
+        return tasks
+    
+    def _sql_feature_tasks(self, backend):
+        """Same feature frames as _feature_tasks, computed by a SQL backend"""
+        return {
+            'family': (self._read_indexed, ('02_family_background', backend.read_table)),
+            'academic': (self._read_indexed, ('03_academic_history', backend.read_table)),
+            'attendance': (backend.aggregate_attendance, ()),
+            'marks': (backend.aggregate_marks, ()),
+            'assignments': (backend.aggregate_assignments, ()),
+            'behavior': (backend.aggregate_behavior, ()),
+            'library': (backend.aggregate_library, ()),
+            'fees': (backend.aggregate_fees, ()),
+            'extracurricular': (backend.aggregate_extracurricular, ())
+        }
+    
+    def _read_indexed(self, table_name, read=None):
+        """Read a per-student base table indexed by student_id"""
+        return (read or self._read_table)(table_name).set_index('student_id')
+    
+    def _read_and_aggregate(self, aggregate_name, *table_names):
+        """Read the given tables and pass them to one _aggregate_* method (by name, so tasks pickle)"""
+        tables = [self._read_table(table_name) for table_name in table_names]
+        # Attendance and marks cut at as_of themselves (they need the days for windows)
+        tables = [self._point_in_time(df, table_name)[0] if table_name not in WINDOW_DATE_COLUMNS else df
+                  for df, table_name in zip(tables, table_names)]
+        return getattr(self, aggregate_name)(*tables)
+    
+    def _join_features(self, students, feature_frames):
+        """Left-join student_id-indexed feature frames onto the students table in one pass"""
+        master_df = students.set_index('student_id').join(feature_frames, how='left')
+        return master_df.reset_index()
+    
+    def _table_path(self, table_name):
+        """Find the file for a table, detecting the format from what exists on disk"""
+        for ext in TABLE_EXTENSIONS:
+            path = f'{self.data_dir}/{table_name}{ext}'
+            if os.path.exists(path):
+                return path, ext
+        
+        raise FileNotFoundError(f"No data file for {table_name} in {self.data_dir}")
+    
+    def _extra_columns(self, table_name):
+        """Columns needed beyond LOADER_COLUMNS (the date column for snapshots)"""
+        if self.as_of is not None and table_name in AS_OF_DATE_COLUMNS:
+            return [AS_OF_DATE_COLUMNS[table_name]]
+        return []
+    
+    def _point_in_time(self, df, table_name):
+        """Drop rows dated after as_of; returns the rows and their days before as_of (None without as_of)"""
+        if self.as_of is None:
+            return df, None
+        
+        # Date strings repeat heavily, so convert each distinct date once
+        dates = df[AS_OF_DATE_COLUMNS[table_name]].astype('category')
+        day_numbers = (self.as_of - pd.to_datetime(dates.cat.categories)).days.to_numpy(dtype='float64')
+        # Code -1 (missing date) picks the appended NaN
+        days = np.append(day_numbers, np.nan)[dates.cat.codes.to_numpy()]
+        
+        keep = ~(days < 0)
+        return df[keep], days[keep]
+    
+    def _window_edges(self):
+        """Sorted window lengths in days: each window and the one before it (for trends)"""
+        return sorted({7 * weeks for weeks in self.windows} | {14 * weeks for weeks in self.windows})
+    
+    def _window_partials(self, student_ids, days, values):
+        """
+        Per-student sums of each `values` column over every trailing window, in one pass
+        
+        Each row is placed once in a bucket between the sorted window edges; one
+        groupby sums per (student, bucket) and a running sum over the buckets gives
+        every window at once (column 'win_<name>:<days>'). Mergeable by summing.
+        """
+        edges = self._window_edges()
+        buckets = np.searchsorted(edges, days, side='right')
+        
+        frame = pd.DataFrame(values)
+        frame['student_id'] = np.asarray(student_ids)
+        frame['bucket'] = buckets
+        sums = frame.groupby(['student_id', 'bucket']).sum().unstack('bucket', fill_value=0)
+        
+        columns = {}
+        for name in values:
+            by_bucket = sums[name].reindex(columns=range(len(edges) + 1), fill_value=0).to_numpy()
+            cumulative = by_bucket.cumsum(axis=1)
+            for i, edge in enumerate(edges):
+                columns[f'win_{name}:{edge}'] = cumulative[:, i]
+        
+        return pd.DataFrame(columns, index=sums.index)
+    
+    def _window_columns(self, partials, name, weeks, previous=False):
+        """A window sum from partials; previous=True gives the window of the same length before it"""
+        current = partials[f'win_{name}:{7 * weeks}']
+        if not previous:
+            return current
+        return partials[f'win_{name}:{14 * weeks}'] - current
+    
+    def _read_table(self, table_name):
+        """Read only the needed columns of one table, with compact dtypes, whatever its format"""
+        path, ext = self._table_path(table_name)
+        usecols, dtype = read_options(table_name, self._extra_columns(table_name))
+        if ext == '.parquet':
+            return pd.read_parquet(path, columns=usecols)
+        return pd.read_csv(path, usecols=usecols, dtype=dtype, engine=CSV_ENGINE)
+    
+    def _iter_table_chunks(self, table_name, chunksize):
+        """Yield a table as DataFrames of at most `chunksize` rows"""
+        path, ext = self._table_path(table_name)
+        usecols, dtype = read_options(table_name, self._extra_columns(table_name))
+        if ext == '.parquet':
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=usecols):
+                yield batch.to_pandas()
+        else:
+            # The pyarrow engine cannot chunk, so chunked reads use the C parser
+            yield from pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize)
+    
+    def _fold_chunks(self, chunks, partial_fn, min_cols=(), max_cols=()):
+        """Fold per-chunk partial aggregates (indexed by student_id) into one running state"""
+        state = None
+        for chunk in chunks:
+            state = self._merge_partials(state, partial_fn(chunk), min_cols, max_cols)
+        return state
+    
+    def _merge_partials(self, state, partial, min_cols=(), max_cols=()):
+        """Merge two partial states: columns sum unless listed as min/max"""
+        if state is None:
+            return partial
+        combined = pd.concat([state, partial]).groupby(level=0)
+        rules = {col: 'min' if col in min_cols else 'max' if col in max_cols else 'sum'
+                 for col in combined.obj.columns}
+        return combined.agg(rules)
+    
     def _aggregate_attendance(self, df):
-        """Aggregate attendance metrics"""
-        agg = df.groupby('student_id').agg({
-            'status': [
-                ('attendance_total_days', 'count'),
-                ('attendance_present_days', lambda x: (x == 'Present').sum()),
-                ('attendance_absent_days', lambda x: (x == 'Absent').sum())
-            ]
+        """Aggregate attendance metrics (single groupby over indicator columns)"""
+        return self._finalize_attendance(self._attendance_partials(df))
+    
+    def _aggregate_attendance_chunked(self):
+        """Out-of-core attendance aggregation; same columns as _aggregate_attendance"""
+        chunks = self._iter_table_chunks('04_daily_attendance', self.chunksize)
+        return self._finalize_attendance(self._fold_chunks(chunks, self._attendance_partials))
+    
+    def _attendance_partials(self, df):
+        """Per-student day counts for one slice of attendance; mergeable by summing"""
+        df, days = self._point_in_time(df, '04_daily_attendance')
+        present = df['status'] == 'Present'
+        first_half = df['week_number'] <= 4
+        
+        indicators = pd.DataFrame({
+            'student_id': df['student_id'],
+            'status_attendance_total_days': df['status'].notna(),
+            'status_attendance_present_days': present,
+            'status_attendance_absent_days': df['status'] == 'Absent',
+            'first_days': first_half,
+            'first_present': present & first_half,
+            'second_days': ~first_half,
+            'second_present': present & ~first_half
         })
-        agg.columns = ['_'.join(col).strip() for col in agg.columns.values]
-        agg.reset_index(inplace=True)
+        partials = indicators.groupby('student_id').sum().astype('int64')
+        
+        if self.windows:
+            partials = partials.join(self._window_partials(df['student_id'], days, {
+                'days': df['status'].notna().to_numpy(),
+                'present': present.to_numpy()
+            }))
+        return partials
+    
+    def _finalize_attendance(self, partials):
+        """Turn summed day counts into the attendance feature columns"""
+        agg = partials.copy()
         
         # Calculate percentage
         agg['attendance_percentage'] = (agg['status_attendance_present_days'] / 
                                         agg['status_attendance_total_days'] * 100)
         
-        # Attendance trend (first 4 weeks vs last 4 weeks)
-        first_half = df[df['week_number'] <= 4].groupby('student_id')['status'].apply(
-            lambda x: (x == 'Present').sum() / len(x) * 100
-        ).rename('attendance_first_half')
-        
-        second_half = df[df['week_number'] > 4].groupby('student_id')['status'].apply(
-            lambda x: (x == 'Present').sum() / len(x) * 100
-        ).rename('attendance_second_half')
-        
-        agg = agg.merge(first_half, on='student_id', how='left')
-        agg = agg.merge(second_half, on='student_id', how='left')
-        
+        # Attendance trend (first 4 weeks vs last 4 weeks); NaN when a half has no days
+        agg['attendance_first_half'] = agg['first_present'] / agg['first_days'].replace(0, np.nan) * 100
+        agg['attendance_second_half'] = agg['second_present'] / agg['second_days'].replace(0, np.nan) * 100
         agg['attendance_trend'] = agg['attendance_second_half'] - agg['attendance_first_half']
         
-        return agg
+        # Trailing windows ending at as_of; trend is the change from the window before
+        for weeks in self.windows:
+            days = self._window_columns(agg, 'days', weeks)
+            rate = self._window_columns(agg, 'present', weeks) / days.replace(0, np.nan) * 100
+            previous_rate = (self._window_columns(agg, 'present', weeks, previous=True) /
+                             self._window_columns(agg, 'days', weeks, previous=True).replace(0, np.nan) * 100)
+            agg[f'attendance_days_{weeks}w'] = days
+            agg[f'attendance_percentage_{weeks}w'] = rate
+            agg[f'attendance_trend_{weeks}w'] = rate - previous_rate
+        
+        helpers = ['first_days', 'first_present', 'second_days', 'second_present']
+        return agg.drop(columns=helpers + [col for col in agg.columns if col.startswith('win_')])
     
     def _aggregate_marks(self, df):
         """Aggregate marks metrics"""
-        agg = df.groupby('student_id').agg({
-            'percentage': ['mean', 'std', 'min', 'max'],
-            'obtained_marks': 'sum'
-        })
-        agg.columns = ['marks_' + '_'.join(col).strip() for col in agg.columns.values]
-        agg.reset_index(inplace=True)
+        if self.as_of is not None:
+            # Snapshots go through the mergeable state, which carries the window sums
+            return self._finalize_marks(self._marks_partials(df))
+        
+        agg = df.groupby('student_id').agg(
+            marks_percentage_mean=('percentage', 'mean'),
+            marks_percentage_std=('percentage', 'std'),
+            marks_percentage_min=('percentage', 'min'),
+            marks_percentage_max=('percentage', 'max'),
+            marks_obtained_marks_sum=('obtained_marks', 'sum')
+        )
         
         # Subject-wise performance
-        subject_perf = df.groupby(['student_id', 'subject'])['percentage'].mean().unstack(fill_value=0)
+        subject_perf = df.groupby(['student_id', 'subject'], observed=True)['percentage'].mean().unstack(fill_value=0)
         subject_perf.columns = ['marks_subject_' + col.lower().replace(' ', '_') for col in subject_perf.columns]
-        subject_perf.reset_index(inplace=True)
-        
-        agg = agg.merge(subject_perf, on='student_id', how='left')
         
         # Failing subjects count
-        failing = df[df['percentage'] < 40].groupby('student_id').size().rename('marks_failing_count')
-        agg = agg.merge(failing, on='student_id', how='left')
-        agg['marks_failing_count'].fillna(0, inplace=True)
+        failing = (df['percentage'] < 40).groupby(df['student_id']).sum()
+        failing = failing.astype('float64').rename('marks_failing_count')
+        
+        return agg.join([subject_perf, failing])
+    
+    def _aggregate_marks_chunked(self):
+        """
+        Out-of-core marks aggregation; same columns as _aggregate_marks
+        
+        Each chunk folds into per-student count/sum/sum-of-squares/min/max plus
+        per-subject sums and counts, so std and subject means come out at the end
+        """
+        chunks = self._iter_table_chunks('05_marks_exams', self.chunksize)
+        partials = self._fold_chunks(chunks, self._marks_partials,
+                                     min_cols=('pct_min',), max_cols=('pct_max',))
+        return self._finalize_marks(partials)
+    
+    def _marks_partials(self, df):
+        """Per-student mergeable marks state for one slice of the marks table"""
+        df, days = self._point_in_time(df, '05_marks_exams')
+        pct = df['percentage']
+        partials = pd.DataFrame({
+            'student_id': df['student_id'],
+            'pct_count': pct.notna(),
+            'pct_sum': pct,
+            'pct_sumsq': pct ** 2,
+            'pct_min': pct,
+            'pct_max': pct,
+            'obtained_sum': df['obtained_marks'],
+            'failing': pct < 40
+        }).groupby('student_id').agg({
+            'pct_count': 'sum', 'pct_sum': 'sum', 'pct_sumsq': 'sum',
+            'pct_min': 'min', 'pct_max': 'max', 'obtained_sum': 'sum', 'failing': 'sum'
+        })
+        
+        by_subject = df.groupby(['student_id', 'subject'], observed=True)['percentage'].agg(['sum', 'count'])
+        by_subject = by_subject.unstack()
+        by_subject.columns = [f'subject_{stat}:{subject}' for stat, subject in by_subject.columns]
+        partials = partials.join(by_subject)
+        
+        if self.windows:
+            partials = partials.join(self._window_partials(df['student_id'], days, {
+                'count': pct.notna().to_numpy(),
+                'sum': pct.fillna(0).to_numpy(),
+                'failing': (pct < 40).to_numpy()
+            }))
+        return partials
+    
+    def _finalize_marks(self, partials):
+        """Turn folded marks state into the _aggregate_marks columns"""
+        n = partials['pct_count']
+        mean = partials['pct_sum'] / n
+        variance = (partials['pct_sumsq'] - n * mean ** 2) / (n - 1)
+        
+        agg = pd.DataFrame({
+            'marks_percentage_mean': mean,
+            'marks_percentage_std': np.sqrt(variance.clip(lower=0)),
+            'marks_percentage_min': partials['pct_min'],
+            'marks_percentage_max': partials['pct_max'],
+            'marks_obtained_marks_sum': partials['obtained_sum']
+        })
+        
+        # Subject means, 0 where a student has no marks in a subject (as unstack(fill_value=0))
+        subjects = sorted(col.split(':', 1)[1] for col in partials.columns if col.startswith('subject_sum:'))
+        for subject in subjects:
+            counts = partials[f'subject_count:{subject}'].fillna(0)
+            sums = partials[f'subject_sum:{subject}'].fillna(0)
+            agg['marks_subject_' + subject.lower().replace(' ', '_')] = (sums / counts.replace(0, np.nan)).fillna(0)
+        
+        agg['marks_failing_count'] = partials['failing'].astype('float64')
+        
+        # Trailing windows ending at as_of
+        for weeks in self.windows:
+            count = self._window_columns(partials, 'count', weeks)
+            agg[f'marks_exam_count_{weeks}w'] = count
+            agg[f'marks_percentage_mean_{weeks}w'] = self._window_columns(partials, 'sum', weeks) / count.replace(0, np.nan)
+            agg[f'marks_failing_count_{weeks}w'] = self._window_columns(partials, 'failing', weeks)
         
         return agg
     
     def _aggregate_assignments(self, df):
         """Aggregate assignment metrics"""
-        agg = df.groupby('student_id').agg({
-            'submitted': lambda x: (x == 'Yes').sum() / len(x) * 100,
-            'status': lambda x: (x == 'Late').sum()
+        return self._finalize_assignments(self._assignment_partials(df))
+    
+    def _assignment_partials(self, df):
+        """Per-student assignment counts for one slice of the table; mergeable by summing"""
+        indicators = pd.DataFrame({
+            'student_id': df['student_id'],
+            'assignments_total': True,
+            'submitted': df['submitted'] == 'Yes',
+            'late': df['status'] == 'Late'
         })
-        agg.columns = ['assignment_submission_rate', 'assignment_late_count']
-        agg.reset_index(inplace=True)
         
         # Grade distribution
         grade_counts = pd.get_dummies(df['grade'], prefix='assignment_grade')
-        grade_counts['student_id'] = df['student_id']
-        grade_agg = grade_counts.groupby('student_id').sum()
-        agg = agg.merge(grade_agg, on='student_id', how='left')
+        indicators = indicators.join(grade_counts)
         
-        return agg
+        return indicators.groupby('student_id').sum()
+    
+    def _finalize_assignments(self, partials):
+        """Turn summed assignment counts into the assignment feature columns"""
+        agg = pd.DataFrame({
+            'assignment_submission_rate': partials['submitted'] / partials['assignments_total'] * 100,
+            'assignment_late_count': partials['late'].astype('int64')
+        })
+        
+        # Grades missing from some merged slices come back as NaN
+        grades = [col for col in partials.columns if col.startswith('assignment_grade_')]
+        return agg.join(partials[grades].fillna(0).astype('int64'))
     
     def _aggregate_behavior(self, df):
         """Aggregate behavior metrics"""
-        if df.empty:
-            return pd.DataFrame({'student_id': [], 'behavior_positive_count': [], 
-                               'behavior_negative_count': []})
+        return self._finalize_behavior(df.groupby(['student_id', 'behavior_type'], observed=True).size())
+    
+    def _finalize_behavior(self, type_counts):
+        """Behavior columns from report counts indexed by (student_id, behavior_type)"""
+        if type_counts.empty:
+            return pd.DataFrame({'behavior_positive_count': [], 'behavior_negative_count': []},
+                                index=pd.Index([], name='student_id'))
         
-        agg = df.groupby(['student_id', 'behavior_type']).size().unstack(fill_value=0)
+        agg = type_counts.unstack(fill_value=0)
         agg.columns = ['behavior_' + col.lower() + '_count' for col in agg.columns]
-        agg.reset_index(inplace=True)
         
         if 'behavior_positive_count' not in agg.columns:
             agg['behavior_positive_count'] = 0
@@ -171,78 +602,96 @@ class DataLoader:
     def _aggregate_library(self, df):
         """Aggregate library metrics"""
         if df.empty:
-            return pd.DataFrame({'student_id': [], 'library_visits': [], 
-                               'library_hours': []})
+            return pd.DataFrame({'library_visits': [], 'library_hours': []},
+                                index=pd.Index([], name='student_id'))
         
-        agg = df.groupby('student_id').agg({
-            'visit_date': 'count',
-            'duration_hours': 'sum'
-        })
-        agg.columns = ['library_visits', 'library_hours']
-        agg.reset_index(inplace=True)
-        agg['library_hours'].fillna(0, inplace=True)
+        return self._finalize_library(self._library_partials(df))
+    
+    def _library_partials(self, df):
+        """Per-student visit count and hours for one slice of library usage; mergeable by summing"""
+        return df.groupby('student_id').agg(
+            library_visits=('visit_date', 'count'),
+            library_hours=('duration_hours', 'sum')
+        )
+    
+    def _finalize_library(self, partials):
+        """Turn summed library partials into the library feature columns"""
+        agg = partials.copy()
+        agg['library_hours'] = agg['library_hours'].fillna(0)
         
         return agg
     
     def _aggregate_fees(self, df):
-        """Aggregate fee metrics"""
-        agg = df.groupby('student_id').agg({
-            'amount_paid': 'sum',
-            'status': lambda x: (x.str.contains('Pending')).sum()
+        """Aggregate fee metrics (paid total, pending and late counts in one pass)"""
+        return self._finalize_fees(self._fee_partials(df))
+    
+    def _fee_partials(self, df):
+        """Per-student paid total and pending/late counts for one slice of fees; mergeable by summing"""
+        status = df['status'].astype(str)
+        indicators = pd.DataFrame({
+            'student_id': df['student_id'],
+            'fee_total_paid': df['amount_paid'],
+            'fee_pending_count': status.str.contains('Pending'),
+            'fee_late_count': status.str.contains('Late')
         })
-        agg.columns = ['fee_total_paid', 'fee_pending_count']
-        agg.reset_index(inplace=True)
-        
-        # Late payment count
-        late = df[df['status'].str.contains('Late', na=False)].groupby('student_id').size().rename('fee_late_count')
-        agg = agg.merge(late, on='student_id', how='left')
-        agg['fee_late_count'].fillna(0, inplace=True)
+        return indicators.groupby('student_id').sum()
+    
+    def _finalize_fees(self, partials):
+        """Turn summed fee partials into the fee feature columns"""
+        agg = partials.copy()
+        agg['fee_pending_count'] = agg['fee_pending_count'].astype('int64')
+        # Kept as float like the earlier merge/fillna version
+        agg['fee_late_count'] = agg['fee_late_count'].astype('float64')
         
         return agg
     
     def _aggregate_extracurricular(self, reg_df, details_df, attendance_df):
         """Aggregate extracurricular metrics"""
-        # Registration summary
-        agg = reg_df[['student_id', 'total_activities']].copy()
-        agg['extra_participates'] = (reg_df['participation_status'] == 'Active').astype(int)
+        parts = []
         
         # Details aggregation
         if not details_df.empty:
+            details_by_student = details_df.groupby('student_id')
+            
             # Activity categories
             categories = pd.get_dummies(details_df['activity_category'], prefix='extra_category')
-            categories['student_id'] = details_df['student_id']
-            cat_agg = categories.groupby('student_id').sum()
-            agg = agg.merge(cat_agg, on='student_id', how='left')
+            parts.append(categories.groupby(details_df['student_id']).sum())
             
             # Leadership roles
-            leadership = details_df[details_df['role'].isin(['Coordinator', 'President/Head'])]
-            leadership_count = leadership.groupby('student_id').size().rename('extra_leadership_roles')
-            agg = agg.merge(leadership_count, on='student_id', how='left')
-            agg['extra_leadership_roles'].fillna(0, inplace=True)
+            leadership = details_df['role'].isin(['Coordinator', 'President/Head'])
+            parts.append(leadership.groupby(details_df['student_id']).sum().rename('extra_leadership_roles'))
             
-            # Average hours per week
-            hours = details_df.groupby('student_id')['hours_per_week'].mean().rename('extra_hours_per_week')
-            agg = agg.merge(hours, on='student_id', how='left')
-            
-            # Total events
-            events = details_df.groupby('student_id')['total_events_participated'].sum().rename('extra_total_events')
-            agg = agg.merge(events, on='student_id', how='left')
+            # Average hours per week, total events
+            parts.append(details_by_student['hours_per_week'].mean().rename('extra_hours_per_week'))
+            parts.append(details_by_student['total_events_participated'].sum().rename('extra_total_events'))
         
         # Attendance aggregation
         if not attendance_df.empty:
-            extra_attendance = attendance_df.groupby('student_id').agg({
-                'attendance_status': [
-                    ('extra_sessions_total', 'count'),
-                    ('extra_sessions_present', lambda x: (x == 'Present').sum())
-                ]
-            })
-            extra_attendance.columns = ['_'.join(col).strip() for col in extra_attendance.columns.values]
-            extra_attendance.reset_index(inplace=True)
-            extra_attendance['extra_attendance_percentage'] = (
-                extra_attendance['attendance_status_extra_sessions_present'] / 
-                extra_attendance['attendance_status_extra_sessions_total'] * 100
-            )
-            agg = agg.merge(extra_attendance, on='student_id', how='left')
+            session_counts = pd.DataFrame({
+                'student_id': attendance_df['student_id'],
+                'attendance_status_extra_sessions_total': attendance_df['attendance_status'].notna(),
+                'attendance_status_extra_sessions_present': attendance_df['attendance_status'] == 'Present'
+            }).groupby('student_id').sum().astype('int64')
+            parts.append(self._extra_attendance_rate(session_counts))
+        
+        return self._finalize_extracurricular(reg_df, parts)
+    
+    def _extra_attendance_rate(self, session_counts):
+        """Add extra_attendance_percentage to per-student session total/present counts"""
+        session_counts['extra_attendance_percentage'] = (
+            session_counts['attendance_status_extra_sessions_present'] / 
+            session_counts['attendance_status_extra_sessions_total'] * 100
+        )
+        return session_counts
+    
+    def _finalize_extracurricular(self, reg_df, parts):
+        """Join per-student extracurricular parts (details, session counts) onto the registrations"""
+        # Registration summary
+        agg = reg_df[['student_id', 'total_activities']].set_index('student_id')
+        agg['extra_participates'] = (reg_df['participation_status'] == 'Active').astype(int).values
+        
+        if parts:
+            agg = agg.join(parts)
         
         # Fill NaN
         agg.fillna(0, inplace=True)
@@ -325,12 +774,35 @@ class DataLoader:
         return df
 
 
+def write_processed_data(master_df, cache_key=None, path='processed_data.csv'):
+    """
+    Write the master frame for the dashboard loader and the train_model.py CLI,
+    unless the file there was already written from the same input fingerprint
+    (DataLoader.cache_key, recorded next to it in <path>.key). Returns whether it wrote.
+    """
+    key_path = f'{path}.key'
+    if cache_key is not None and os.path.exists(path) and os.path.exists(key_path):
+        with open(key_path) as f:
+            if f.read().strip() == cache_key:
+                return False
+    
+    master_df.to_csv(path, index=False)
+    if cache_key is None:
+        # Written without a fingerprint: nothing may treat it as current
+        if os.path.exists(key_path):
+            os.remove(key_path)
+    else:
+        with open(key_path, 'w') as f:
+            f.write(cache_key)
+    return True
+
+
 if __name__ == "__main__":
     loader = DataLoader(data_dir='dummy_data')
     master_df = loader.load_all_data()
     
     # Save processed data
-    master_df.to_csv('processed_data.csv', index=False)
+    write_processed_data(master_df)
     print(f"\n💾 Saved processed data: processed_data.csv")
     print(f"Shape: {master_df.shape}")
     print(f"\nColumns: {list(master_df.columns)}")
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+FEATURE DRIFT
+Per-feature reference distributions of the training matrix and the population
+stability index (PSI) of new data against them
+"""
+
+import numpy as np
+
+DRIFT_FILE = 'drift_reference.npz'
+
+# Floor for empty bins, so the log ratio stays finite
+PSI_EPSILON = 1e-4
+
+
+def _bin_proportions(column, edges):
+    counts = np.bincount(np.searchsorted(edges, column, side='right'), minlength=len(edges) + 1)
+    return np.maximum(counts / max(len(column), 1), PSI_EPSILON)
+
+
+class DriftReference:
+    """
+    Quantile bin edges and bin proportions per feature of a training matrix.
+    Repeated edges (binary flags, label codes) simply leave empty bins.
+    """
+    
+    def __init__(self, feature_names, edges, proportions):
+        self.feature_names = list(feature_names)
+        self.edges = np.asarray(edges, dtype='float64')
+        self.proportions = np.asarray(proportions, dtype='float64')
+    
+    @classmethod
+    def from_matrix(cls, X, n_bins=10, max_rows=100000, random_state=42):
+        """Profile the columns of X (a sample of max_rows rows for large matrices)"""
+        feature_names = list(X.columns)
+        # Sample before converting, so a memory-mapped matrix is never read whole
+        values = np.asarray(X)
+        if len(values) > max_rows:
+            rows = np.sort(np.random.default_rng(random_state).choice(len(values), max_rows, replace=False))
+            values = values[rows]
+        values = values.astype('float64')
+        
+        quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+        edges = np.quantile(values, quantiles, axis=0).T
+        proportions = np.array([_bin_proportions(values[:, j], edges[j]) for j in range(values.shape[1])])
+        return cls(feature_names, edges, proportions)
+    
+    def psi(self, X):
+        """Population stability index of each column of X (same feature order) against the reference"""
+        values = np.asarray(X, dtype='float64')
+        actual = np.array([_bin_proportions(values[:, j], self.edges[j]) for j in range(values.shape[1])])
+        return ((actual - self.proportions) * np.log(actual / self.proportions)).sum(axis=1)
+    
+    def save(self, path):
+        np.savez(path, feature_names=np.asarray(self.feature_names, dtype=str),
+                 edges=self.edges, proportions=self.proportions)
+    
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['feature_names'].tolist(), data['edges'], data['proportions'])
@@ -135,13 +135,18 @@ class ModelExplainer:
 
 
 if __name__ == "__main__":
-    # Load data
-    df = pd.read_csv('processed_data.csv')
-    
-    # Prepare features (use same preprocessing as training)
-    from train_model import DropoutModel
-    model = DropoutModel()
-    X, y = model.prepare_data(df)
+    # Model matrix of the last training run, if its features were materialized
+    from feature_store import FeatureStore
+    feature_store = FeatureStore(store_dir='models/feature_store', model_dir='models')
+    if feature_store.is_current(matrix=True) and feature_store.manifest()['training'] is not None:
+        print("📦 Using the training matrix from the feature store")
+        X, y = feature_store.read_training()
+    else:
+        # Prepare features (use same preprocessing as training)
+        df = pd.read_csv('processed_data.csv')
+        from train_model import DropoutModel
+        model = DropoutModel()
+        X, y = model.prepare_data(df)
     
     # Explain model
     explainer_obj = ModelExplainer(model_dir='models')
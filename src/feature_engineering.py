@@ -5,21 +5,232 @@ Advanced feature creation for better predictions
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder, StandardScaler
 import joblib
 
+# Optional: numexpr evaluates the composite scores in one multithreaded pass
+try:
+    import numexpr
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+
+# Declarative feature registry, in engineer_features column order. Each feature names
+# its inputs: a (column, default) tuple is a master-frame column with the default
+# engineer_features uses when it is absent; a plain string is another registered
+# feature. Values come from an 'expression' (numexpr when available) or a
+# 'compute' function over NumPy arrays. 'dtype' is int64, float64, or 'promote'
+# (int64 when every input is an integer, as pandas arithmetic would keep it).
+FEATURE_REGISTRY = {
+    # 1. Academic engagement score
+    'academic_engagement': {
+        'inputs': {'attendance': ('attendance_percentage', 50), 'marks': ('marks_percentage_mean', 50),
+                   'submission': ('assignment_submission_rate', 50), 'library': ('library_visits', 0)},
+        'expression': 'attendance * 0.4 + marks * 0.3 + submission * 0.2 + library * 2 * 0.1',
+        'dtype': 'float64'
+    },
+    # 2. Financial stress indicator
+    'financial_stress': {
+        'inputs': {'pending_flag': 'flag_fee_pending', 'late': ('fee_late_count', 0)},
+        'expression': 'pending_flag * 50 + late * 10',
+        'clip': (0, 100),
+        'dtype': 'promote'
+    },
+    # 3. Social engagement score
+    'social_engagement': {
+        'inputs': {'participates': ('extra_participates', 0), 'activities': ('total_activities', 0),
+                   'leadership': ('extra_leadership_roles', 0), 'positive': ('behavior_positive_count', 0)},
+        'expression': 'participates * 30 + activities * 20 + leadership * 30 + positive * 10',
+        'clip': (0, 100),
+        'dtype': 'promote'
+    },
+    # 4. Academic trend (0 unless both GPAs are present)
+    'gpa_change': {
+        'inputs': {'current': ('current_semester_gpa', None), 'previous': ('previous_semester_gpa', None)},
+        'compute': lambda current, previous: (
+            0 if current is None or previous is None
+            else current - np.where(np.isnan(previous), current, previous)
+        ),
+        'dtype': 'promote'
+    },
+    'gpa_improving': {
+        'inputs': {'change': 'gpa_change'},
+        'compute': lambda change: change > 0,
+        'dtype': 'int64'
+    },
+    # 5. At-risk indicators (binary flags)
+    'flag_low_attendance': {
+        'inputs': {'attendance': ('attendance_percentage', 100)},
+        'compute': lambda attendance: attendance < 75,
+        'dtype': 'int64'
+    },
+    'flag_low_gpa': {
+        'inputs': {'gpa': ('cumulative_gpa', 10)},
+        'compute': lambda gpa: gpa < 5.0,
+        'dtype': 'int64'
+    },
+    'flag_failing_courses': {
+        'inputs': {'failing': ('marks_failing_count', 0)},
+        'compute': lambda failing: failing > 0,
+        'dtype': 'int64'
+    },
+    'flag_no_activities': {
+        'inputs': {'participates': ('extra_participates', 1)},
+        'compute': lambda participates: participates == 0,
+        'dtype': 'int64'
+    },
+    'flag_fee_pending': {
+        'inputs': {'pending': ('fee_pending_count', 0)},
+        'compute': lambda pending: pending > 0,
+        'dtype': 'int64'
+    },
+    'total_risk_flags': {
+        'inputs': {'attendance': 'flag_low_attendance', 'gpa': 'flag_low_gpa', 'failing': 'flag_failing_courses',
+                   'activities': 'flag_no_activities', 'fees': 'flag_fee_pending'},
+        'expression': 'attendance + gpa + failing + activities + fees',
+        'dtype': 'int64'
+    },
+    # 6. Learning style indicators (inferred)
+    'learning_visual_score': {
+        'inputs': {'physics': ('marks_subject_physics', 0), 'mathematics': ('marks_subject_mathematics', 0)},
+        'expression': 'physics * 0.5 + mathematics * 0.5',
+        'dtype': 'float64'
+    },
+    'learning_reading_score': {
+        'inputs': {'english': ('marks_subject_english', 0), 'submission': ('assignment_submission_rate', 0)},
+        'expression': 'english * 0.5 + submission * 0.5',
+        'dtype': 'float64'
+    },
+    'learning_kinesthetic_score': {
+        'inputs': {'sports': ('extra_category_Sports', 0), 'mechanical': ('marks_subject_mechanical_engineering', 0)},
+        'expression': 'sports * 50 + mechanical * 0.5',
+        'dtype': 'float64'
+    },
+    'learning_auditory_score': {
+        'inputs': {'cultural': ('extra_category_Cultural', 0)},
+        'expression': 'cultural * 50',
+        'dtype': 'promote'
+    }
+}
+
+# Input dtypes the registry reproduces pandas' results for; anything else
+# (nullable, float32, object...) makes fused mode use the column-by-column path
+FUSED_INPUT_DTYPES = [np.dtype('int64'), np.dtype('float64'), np.dtype('bool')]
+
+
+class FeatureResolver:
+    """
+    Computes registered features over one frame on demand: only the requested
+    features and what they depend on, in dependency order, memoizing every
+    intermediate (and the input block) for later requests on the same frame
+    """
+    
+    def __init__(self, df, registry=FEATURE_REGISTRY):
+        self.df = df
+        self.registry = registry
+        self.n = len(df)
+        self.rows = {}
+        self.values = {}
+    
+    def compute(self, names):
+        """{name: array} for the requested features"""
+        order = self.resolution_order(names)
+        self._load_columns({col for name in order for col in self._raw_columns(name)})
+        for name in order:
+            if name not in self.values:
+                self.values[name] = self._evaluate(name)
+        return {name: self.values[name] for name in names}
+    
+    def resolution_order(self, names):
+        """Requested features and their dependencies, dependencies first"""
+        order, visiting = [], set()
+        
+        def visit(name):
+            if name in order:
+                return
+            if name not in self.registry:
+                raise ValueError(f"Unknown feature {name!r}")
+            if name in visiting:
+                raise ValueError(f"Feature dependency cycle through {name!r}")
+            visiting.add(name)
+            for source in self.registry[name]['inputs'].values():
+                if isinstance(source, str):
+                    visit(source)
+            visiting.discard(name)
+            order.append(name)
+        
+        for name in names:
+            visit(name)
+        return order
+    
+    def _raw_columns(self, name):
+        return [source[0] for source in self.registry[name]['inputs'].values()
+                if not isinstance(source, str) and source[0] in self.df.columns]
+    
+    def _load_columns(self, columns):
+        """Pull not-yet-loaded input columns into one contiguous float64 block"""
+        columns = [col for col in self.df.columns if col in columns and col not in self.rows]
+        if not columns:
+            return
+        block = np.empty((len(columns), self.n))
+        for i, col in enumerate(columns):
+            block[i] = self.df[col].to_numpy(dtype='float64', na_value=np.nan)
+        self.rows.update(zip(columns, block))
+    
+    def _operand(self, source):
+        """Array (or scalar default) for one input, and whether pandas would treat it as integer"""
+        if isinstance(source, str):
+            values = self.values[source]
+            return values, values.dtype.kind == 'i'
+        col, default = source
+        if col in self.rows:
+            return self.rows[col], self.df[col].dtype.kind in 'ib'
+        return default, isinstance(default, int)
+    
+    def _evaluate(self, name):
+        spec = self.registry[name]
+        operands, integral = {}, True
+        for alias, source in spec['inputs'].items():
+            operands[alias], is_integer = self._operand(source)
+            integral = integral and is_integer
+        
+        if 'expression' in spec:
+            if NUMEXPR_AVAILABLE:
+                values = numexpr.evaluate(spec['expression'], local_dict=operands)
+            else:
+                values = eval(spec['expression'], {'__builtins__': {}}, operands)
+        else:
+            values = spec['compute'](**operands)
+        
+        if 'clip' in spec:
+            values = np.clip(values, *spec['clip'])
+        
+        # An integer scalar is the "feature not available" constant (e.g. gpa_change = 0)
+        dtype = spec['dtype']
+        if dtype == 'promote':
+            dtype = 'int64' if integral or isinstance(values, int) else 'float64'
+        return np.broadcast_to(values, self.n).astype(dtype)
+
 
 class FeatureEngineer:
-    def __init__(self):
+    def __init__(self, fused=False):
         self.encoders = {}
         self.scaler = None
-        
+        # Fused mode computes every derived column from one NumPy block of the inputs and
+        # shares the input's columns instead of copying the frame (treat the input as read-only)
+        self.fused = fused
+    
     def engineer_features(self, df):
         """Create advanced features"""
         print("\n" + "="*80)
         print("🔧 FEATURE ENGINEERING")
         print("="*80)
         
+        if self.fused:
+            fused = self._engineer_features_fused(df)
+            if fused is not None:
+                return fused
+        
         df = df.copy()
         
         # 1. Academic engagement score
@@ -92,9 +303,42 @@ class FeatureEngineer:
         
         return df
     
+    def compute_features(self, df, names):
+        """
+        Only the requested registered features (and their dependencies) for df,
+        as a DataFrame on df's index; e.g. a few derived values for one student
+        """
+        values = FeatureResolver(df).compute(names)
+        return pd.DataFrame(values, index=df.index)
+    
+    def _engineer_features_fused(self, df):
+        """
+        Same columns, values and dtypes as engineer_features, from the feature registry
+        
+        Returns None when an input has a dtype the registry does not reproduce exactly.
+        """
+        inputs = {source[0] for spec in FEATURE_REGISTRY.values()
+                  for source in spec['inputs'].values() if not isinstance(source, str)}
+        if any(df[col].dtype not in FUSED_INPUT_DTYPES for col in df.columns if col in inputs):
+            return None
+        
+        out = FeatureResolver(df).compute(list(FEATURE_REGISTRY))
+        
+        # Attach to a shallow copy: the input's column data is shared, not copied
+        # (pd.concat would consolidate, i.e. copy, every block)
+        result = df.copy(deep=False)
+        for name, values in out.items():
+            result[name] = values
+        
+        print(f"✅ Created {len(out)} new features (fused)")
+        
+        return result
+    
     def encode_categorical(self, df, categorical_cols):
         """Encode categorical variables"""
         print("\n🔤 Encoding categorical variables...")
+        # sklearn is only needed for fitting; inference uses the preprocessing artifact
+        from sklearn.preprocessing import LabelEncoder
         
         df = df.copy()
         
@@ -111,6 +355,7 @@ class FeatureEngineer:
     def scale_features(self, df, feature_cols):
         """Scale numerical features"""
         print("\n📏 Scaling numerical features...")
+        from sklearn.preprocessing import StandardScaler
         
         self.scaler = StandardScaler()
         df[feature_cols] = self.scaler.fit_transform(df[feature_cols])
@@ -0,0 +1,267 @@
+"""
+FEATURE STORE
+Materialized per-student features shared by training, batch prediction,
+explainability and the dashboard: the engineered frame, the encoded and scaled
+model matrix (memory-mappable .npy) and a manifest with the feature-set version
+"""
+
+import os
+import json
+import uuid
+import hashlib
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+from feature_engineering import FEATURE_REGISTRY
+from preprocessing_artifact import ARTIFACT_FILE
+
+STORE_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+# Decimal places numeric values are rounded to before row hashing
+HASH_DECIMALS = 6
+
+# Sections of the training matrix, in row order
+TRAINING_SPLITS = ('train', 'valid', 'test')
+
+# Source files whose contents determine the engineered features
+ENGINEERING_CODE_FILES = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feature_engineering.py')
+]
+
+
+def file_digest(path):
+    """sha256 of a file, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def canonical_frame(df):
+    """
+    df with every numeric column as float64 rounded to HASH_DECIMALS and every
+    other column as strings, so a frame hashes the same after a CSV round trip
+    (the parser can be one ulp off, and dtypes such as bool or category are lost)
+    """
+    columns = {}
+    for col, values in df.items():
+        if pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+            columns[col] = values.astype('float64').round(HASH_DECIMALS)
+        else:
+            columns[col] = values.astype('string')
+    return pd.DataFrame(columns, index=df.index)
+
+
+def row_hashes(df):
+    """uint64 hash of each row's values, in canonical form"""
+    return pd.util.hash_pandas_object(canonical_frame(df), index=False).to_numpy()
+
+
+def frame_digest(df, hashes=None):
+    """sha256 over the row hashes of a frame (values and column names, not the index)"""
+    digest = hashlib.sha256(json.dumps([str(col) for col in df.columns]).encode())
+    digest.update((row_hashes(df) if hashes is None else hashes).tobytes())
+    return digest.hexdigest()
+
+
+class FeatureStore:
+    """
+    One materialized feature set per store directory
+    
+    The engineered frame is valid while the master frame and the feature
+    engineering code are unchanged; the model matrix additionally needs the
+    preprocessing artifact it was scaled with. Each write puts its files under a
+    fresh generation token and then replaces the manifest atomically, so readers
+    see either the old feature set or the new one, never a mix.
+    """
+    
+    def __init__(self, store_dir='models/feature_store', model_dir='models'):
+        self.store_dir = store_dir
+        self.model_dir = model_dir
+    
+    def write(self, source_df, engineered_df, X, y=None, split_index=None):
+        """
+        Materialize the engineered frame and model matrix X computed from source_df.
+        With labels y, also the float32 training matrix; split_index
+        ({'train': positions, 'test': positions}, optionally 'valid' positions
+        for early stopping) lays it out as train | valid | test rows.
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        generation = uuid.uuid4().hex[:12]
+        files = {
+            'engineered': f'engineered_{generation}.pkl',
+            'matrix': f'matrix_{generation}.npy',
+            'student_ids': f'student_ids_{generation}.npy',
+            'row_hashes': f'row_hashes_{generation}.npy'
+        }
+        hashes = row_hashes(source_df)
+        
+        engineered_df.to_pickle(self._file(files['engineered']))
+        np.save(self._file(files['matrix']), np.ascontiguousarray(X, dtype='float64'))
+        np.save(self._file(files['student_ids']), source_df['student_id'].to_numpy(dtype='int64'))
+        np.save(self._file(files['row_hashes']), hashes)
+        training = None if y is None else self._write_training(generation, files, X, y, split_index)
+        
+        manifest = {
+            'store_version': STORE_VERSION,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'n_students': len(source_df),
+            'feature_names': list(X.columns),
+            'derived_features': [name for name in FEATURE_REGISTRY if name in engineered_df.columns],
+            'source_digest': frame_digest(source_df, hashes),
+            'engineering_digest': self._engineering_digest(),
+            'preprocessing_digest': self._preprocessing_digest(),
+            'training': training,
+            'files': files
+        }
+        manifest['feature_set_version'] = self._feature_set_version(manifest)
+        
+        path = self._file(MANIFEST_FILE)
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f'{path}.tmp', path)
+        
+        self._remove_stale(files)
+        print(f"💾 Feature store {manifest['feature_set_version']}: {len(source_df)} students "
+              f"x {len(manifest['feature_names'])} features -> {self.store_dir}")
+        return manifest
+    
+    def _write_training(self, generation, files, X, y, split_index):
+        """
+        float32 matrix and labels with rows in split order, so each split is a
+        contiguous (zero-copy) slice of the memory map, and the source row positions
+        """
+        if split_index is None:
+            split_index = {'train': np.arange(len(X))}
+        sections = [np.asarray(split_index.get(name, []), dtype='int64') for name in TRAINING_SPLITS]
+        rows = np.concatenate(sections)
+        
+        files.update({
+            'training_X': f'training_X_{generation}.npy',
+            'training_y': f'training_y_{generation}.npy',
+            'training_rows': f'training_rows_{generation}.npy'
+        })
+        np.save(self._file(files['training_X']), np.asarray(X, dtype='float32')[rows])
+        np.save(self._file(files['training_y']), np.asarray(y, dtype='int64')[rows])
+        np.save(self._file(files['training_rows']), rows.astype('int64'))
+        
+        return {'dtype': 'float32', **{f'n_{name}': len(section) for name, section in zip(TRAINING_SPLITS, sections)}}
+    
+    def manifest(self):
+        """The current manifest, or None if nothing usable has been materialized"""
+        path = self._file(MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest.get('store_version') != STORE_VERSION:
+            return None
+        return manifest
+    
+    def is_current(self, source_df=None, matrix=False):
+        """
+        Whether the stored engineered frame (and, with matrix=True, the model
+        matrix) is valid for source_df. Without source_df the stored rows are
+        taken as they are, e.g. for explaining the last training run.
+        """
+        manifest = self.manifest()
+        if manifest is None or manifest['engineering_digest'] != self._engineering_digest():
+            return False
+        if matrix and (manifest['preprocessing_digest'] is None
+                       or manifest['preprocessing_digest'] != self._preprocessing_digest()):
+            return False
+        return source_df is None or manifest['source_digest'] == frame_digest(source_df)
+    
+    def read_engineered(self):
+        """The engineered frame, rows in source order"""
+        return pd.read_pickle(self._file(self.manifest()['files']['engineered']))
+    
+    def read_matrix(self, mmap=True):
+        """The encoded and scaled model matrix as a DataFrame (memory-mapped, read-only, by default)"""
+        manifest = self.manifest()
+        matrix = np.load(self._file(manifest['files']['matrix']), mmap_mode='r' if mmap else None)
+        return pd.DataFrame(matrix, columns=manifest['feature_names'], copy=False)
+    
+    def read_training(self, split=None):
+        """
+        (X, y) from the float32 training matrix, memory-mapped read-only: every row
+        in split order, or split='train'/'valid'/'test' as views (nothing is copied)
+        """
+        manifest = self.manifest()
+        if manifest['training'] is None:
+            raise ValueError(f"No training matrix in {self.store_dir}; write() was called without labels")
+        rows = self._split_rows(manifest, split)
+        
+        X = np.load(self._file(manifest['files']['training_X']), mmap_mode='r')
+        y = np.load(self._file(manifest['files']['training_y']), mmap_mode='r')
+        return pd.DataFrame(X[rows], columns=manifest['feature_names'], copy=False), y[rows]
+    
+    def read_training_rows(self, split=None):
+        """Source row positions of the training matrix rows"""
+        manifest = self.manifest()
+        return np.load(self._file(manifest['files']['training_rows']))[self._split_rows(manifest, split)]
+    
+    def read_student_ids(self):
+        return np.load(self._file(self.manifest()['files']['student_ids']))
+    
+    def changed_rows(self, source_df):
+        """
+        Boolean mask of the source_df rows that are new or differ from the stored
+        source (matched on student_id); every row if nothing comparable is stored
+        """
+        manifest = self.manifest()
+        if manifest is None or 'row_hashes' not in manifest['files']:
+            return np.ones(len(source_df), dtype=bool)
+        stored = pd.MultiIndex.from_arrays([self.read_student_ids(),
+                                            np.load(self._file(manifest['files']['row_hashes']))])
+        current = pd.MultiIndex.from_arrays([source_df['student_id'].to_numpy(dtype='int64'), row_hashes(source_df)])
+        return ~current.isin(stored)
+    
+    def student_features(self):
+        """Per-student derived features with the feature-set version and timestamp (for the dashboard)"""
+        manifest = self.manifest()
+        engineered = self.read_engineered()
+        table = engineered[['student_id'] + manifest['derived_features']].copy()
+        table['feature_set_version'] = manifest['feature_set_version']
+        table['features_created_at'] = manifest['created_at']
+        return table
+    
+    def _split_rows(self, manifest, split):
+        """Row slice of one split of the training matrix (every row for None)"""
+        if split is None:
+            return slice(None)
+        if split not in TRAINING_SPLITS:
+            raise ValueError(f"Unknown split {split!r}, expected one of {TRAINING_SPLITS} or None")
+        start = 0
+        for name in TRAINING_SPLITS:
+            # Manifests written before the validation split have no n_valid
+            size = manifest['training'].get(f'n_{name}', 0)
+            if name == split:
+                return slice(start, start + size)
+            start += size
+    
+    def _file(self, name):
+        return os.path.join(self.store_dir, name)
+    
+    def _engineering_digest(self):
+        return hashlib.sha256(''.join(file_digest(path) for path in ENGINEERING_CODE_FILES).encode()).hexdigest()
+    
+    def _preprocessing_digest(self):
+        """Digest of the model directory's preprocessing artifact (None if it has none)"""
+        path = os.path.join(self.model_dir, ARTIFACT_FILE)
+        return file_digest(path) if os.path.exists(path) else None
+    
+    def _feature_set_version(self, manifest):
+        """Short id of the feature definitions, preprocessing and feature order"""
+        key = [manifest['engineering_digest'], manifest['preprocessing_digest'], manifest['feature_names']]
+        return hashlib.sha256(json.dumps(key).encode()).hexdigest()[:12]
+    
+    def _remove_stale(self, files):
+        """Delete the files of earlier generations"""
+        current = set(files.values()) | {MANIFEST_FILE}
+        for name in os.listdir(self.store_dir):
+            if name not in current and name.rsplit('.', 1)[-1] in ('pkl', 'npy'):
+                os.remove(self._file(name))
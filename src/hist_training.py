@@ -0,0 +1,109 @@
+"""
+HISTOGRAM TRAINING
+Streams batches of a memory-mapped feature matrix into XGBoost's quantile
+(or external-memory) DMatrix and trains tree_method='hist' with early stopping
+"""
+
+import os
+import numpy as np
+import xgboost as xgb
+
+from hyperparameter_search import BASE_PARAMS, DEFAULT_PARAMS
+
+# Rows per batch handed to XGBoost; memory use is bounded by one batch plus the binned matrix
+DEFAULT_BATCH_ROWS = 100000
+
+
+def batch_slices(n_rows, batch_rows=DEFAULT_BATCH_ROWS):
+    """Consecutive row slices covering n_rows"""
+    return [slice(start, min(start + batch_rows, n_rows)) for start in range(0, n_rows, batch_rows)]
+
+
+def chunk_batches(X, y, batch_rows=DEFAULT_BATCH_ROWS):
+    """(X, y) views of one array pair in batches of rows (memory maps stay on disk until read)"""
+    return [(X[rows], y[rows]) for rows in batch_slices(len(y), batch_rows)]
+
+
+def balanced_class_weights(batches, num_class):
+    """n / (num_class * count) per class, counted batch by batch (stands in for SMOTE, which cannot stream)"""
+    counts = np.zeros(num_class, dtype='int64')
+    for _, y in batches:
+        counts += np.bincount(np.asarray(y, dtype='int64'), minlength=num_class)
+    return counts.sum() / (num_class * np.maximum(counts, 1))
+
+
+class BatchIter(xgb.DataIter):
+    """
+    Feeds (X, y) batches to XGBoost one at a time. With a cache_prefix XGBoost
+    keeps the binned pages on disk (external memory) instead of in RAM.
+    """
+    
+    def __init__(self, batches, feature_names, class_weights=None, cache_prefix=None):
+        self.batches = batches
+        self.feature_names = feature_names
+        self.class_weights = class_weights
+        self.position = 0
+        super().__init__(cache_prefix=cache_prefix)
+    
+    def next(self, input_data):
+        if self.position == len(self.batches):
+            return False
+        X, y = self.batches[self.position]
+        y = np.asarray(y, dtype='int64')
+        weight = None if self.class_weights is None else self.class_weights[y]
+        input_data(data=np.asarray(X, dtype='float32'), label=y, weight=weight,
+                    feature_names=self.feature_names)
+        self.position += 1
+        return True
+    
+    def reset(self):
+        self.position = 0
+
+
+def build_dmatrix(batches, feature_names, class_weights=None, ref=None, max_bin=256,
+                  external_memory=False, cache_dir=None, nthread=None, name='train'):
+    """QuantileDMatrix over the batches, or ExtMemQuantileDMatrix paging to cache_dir/<name>"""
+    if external_memory:
+        os.makedirs(cache_dir, exist_ok=True)
+        iterator = BatchIter(batches, feature_names, class_weights,
+                             cache_prefix=os.path.join(cache_dir, name))
+        return xgb.ExtMemQuantileDMatrix(iterator, max_bin=max_bin, ref=ref, nthread=nthread)
+    iterator = BatchIter(batches, feature_names, class_weights)
+    return xgb.QuantileDMatrix(iterator, max_bin=max_bin, ref=ref, nthread=nthread)
+
+
+def booster_params(params=None, n_jobs=None):
+    """Native xgb.train parameters (and boosting rounds) from sklearn-style ones"""
+    params = {**BASE_PARAMS, **(params or DEFAULT_PARAMS)}
+    num_boost_round = params.pop('n_estimators')
+    params['seed'] = params.pop('random_state')
+    params['tree_method'] = 'hist'
+    if n_jobs is not None:
+        params['nthread'] = n_jobs
+    return params, num_boost_round
+
+
+def train_hist(train_batches, valid_batches, feature_names, params=None, class_weights=None,
+               early_stopping_rounds=20, max_bin=256, external_memory=False, cache_dir=None, n_jobs=None):
+    """
+    Train a hist booster on streamed batches, early-stopped on the validation
+    batches' mlogloss. Returns an XGBClassifier holding the best iteration.
+    """
+    dtrain = build_dmatrix(train_batches, feature_names, class_weights, max_bin=max_bin,
+                           external_memory=external_memory, cache_dir=cache_dir, nthread=n_jobs)
+    # Validation reuses the training quantile cuts
+    dvalid = build_dmatrix(valid_batches, feature_names, ref=dtrain, max_bin=max_bin,
+                           external_memory=external_memory, cache_dir=cache_dir, nthread=n_jobs, name='valid')
+    
+    native_params, num_boost_round = booster_params(params, n_jobs)
+    booster = xgb.train(native_params, dtrain, num_boost_round=num_boost_round,
+                        evals=[(dvalid, 'validation')], early_stopping_rounds=early_stopping_rounds,
+                        verbose_eval=False)
+    print(f"   Best iteration {booster.best_iteration + 1}/{num_boost_round}, "
+          f"validation mlogloss {booster.best_score:.4f}")
+    
+    # Same predict/predict_proba interface as the in-memory model
+    model = xgb.XGBClassifier()
+    model.load_model(booster[:booster.best_iteration + 1].save_raw())
+    return model
+
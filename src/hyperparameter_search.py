@@ -0,0 +1,202 @@
+"""
+HYPERPARAMETER SEARCH
+Successive halving over XGBoost configurations, scored by stratified-CV
+mlogloss with early stopping, trials spread across a process pool
+"""
+
+import os
+import math
+import json
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from sklearn.model_selection import StratifiedKFold
+from xgboost import XGBClassifier
+from imblearn.over_sampling import SMOTE
+
+BEST_PARAMS_FILE = 'best_params.json'
+
+# Fixed settings of the dropout classifier (everything the search does not tune)
+BASE_PARAMS = {
+    'objective': 'multi:softmax',
+    'num_class': 3,
+    'random_state': 42,
+    'eval_metric': 'mlogloss'
+}
+
+# Defaults DropoutModel trains with when no search has been run
+DEFAULT_PARAMS = {
+    'n_estimators': 200,
+    'max_depth': 6,
+    'learning_rate': 0.1,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8
+}
+
+# Values sampled per trial (n_estimators comes from early stopping instead)
+SEARCH_SPACE = {
+    'max_depth': [3, 4, 5, 6, 8],
+    'learning_rate': [0.03, 0.05, 0.1, 0.2],
+    'subsample': [0.6, 0.7, 0.8, 0.9, 1.0],
+    'colsample_bytree': [0.5, 0.6, 0.8, 1.0],
+    'min_child_weight': [1, 3, 5],
+    'gamma': [0, 0.1, 0.5],
+    'reg_lambda': [0.5, 1, 2, 5]
+}
+
+# Set once per worker process by _init_worker, so trials don't re-send the data
+_WORKER_DATA = {}
+
+
+def thread_budget(n_tasks, max_workers=None, total_threads=None):
+    """
+    Split the thread budget between the outer pool and XGBoost: (workers, n_jobs)
+    with workers * n_jobs <= total_threads (default: every core)
+    """
+    total_threads = total_threads or os.cpu_count() or 1
+    workers = max(1, min(max_workers or total_threads, n_tasks, total_threads))
+    return workers, max(1, total_threads // workers)
+
+
+def sample_configs(space, n_trials, random_state=42):
+    """n_trials distinct random configurations from a {param: values} space (fewer if the space is smaller)"""
+    rng = np.random.default_rng(random_state)
+    configs, seen = [], set()
+    for _ in range(n_trials * 20):
+        config = {name: values[rng.integers(len(values))] for name, values in space.items()}
+        config = {name: value.item() if isinstance(value, np.generic) else value for name, value in config.items()}
+        key = tuple(sorted(config.items()))
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+        if len(configs) == n_trials:
+            break
+    return configs
+
+
+def _init_worker(X, y, folds, handle_imbalance):
+    _WORKER_DATA.update(X=X, y=y, folds=folds, handle_imbalance=handle_imbalance)
+
+
+def _run_trial(config, n_estimators, early_stopping_rounds, n_jobs):
+    """
+    Mean best validation mlogloss and mean best round of one configuration over
+    the CV folds, and whether early stopping ended every fold before n_estimators
+    """
+    X, y = _WORKER_DATA['X'], _WORKER_DATA['y']
+    losses, rounds, stopped = [], [], True
+    for train_idx, valid_idx in _WORKER_DATA['folds']:
+        X_train, y_train = X[train_idx], y[train_idx]
+        # Oversample the training fold only, as DropoutModel.train does
+        if _WORKER_DATA['handle_imbalance']:
+            X_train, y_train = SMOTE(random_state=42).fit_resample(X_train, y_train)
+        
+        model = XGBClassifier(**BASE_PARAMS, **config, n_estimators=n_estimators,
+                              early_stopping_rounds=early_stopping_rounds, n_jobs=n_jobs)
+        model.fit(X_train, y_train, eval_set=[(X[valid_idx], y[valid_idx])], verbose=False)
+        
+        history = model.evals_result()['validation_0']['mlogloss']
+        losses.append(min(history))
+        rounds.append(int(np.argmin(history)) + 1)
+        stopped = stopped and len(history) < n_estimators
+    return float(np.mean(losses)), int(round(np.mean(rounds))), stopped
+
+
+class HyperparameterSearch:
+    """
+    Successive halving: every sampled configuration gets min_rounds boosting
+    rounds, then only the best 1/eta go on to eta times more rounds, until
+    max_rounds. Each fit also stops early once the fold's mlogloss has not
+    improved for early_stopping_rounds, so hopeless configurations cost little.
+    
+    Trials run in a process pool of `workers` processes, each training with
+    n_jobs XGBoost threads; thread_budget keeps workers * n_jobs within the cores.
+    """
+    
+    def __init__(self, space=None, n_trials=27, cv=3, eta=3, min_rounds=50, max_rounds=450,
+                 early_stopping_rounds=20, max_workers=None, total_threads=None,
+                 handle_imbalance=True, random_state=42):
+        if eta < 2:
+            raise ValueError(f"eta must be at least 2, got {eta}")
+        if min_rounds > max_rounds:
+            raise ValueError(f"min_rounds ({min_rounds}) is larger than max_rounds ({max_rounds})")
+        self.space = space or SEARCH_SPACE
+        self.n_trials = n_trials
+        self.cv = cv
+        self.eta = eta
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.early_stopping_rounds = early_stopping_rounds
+        self.max_workers = max_workers
+        self.total_threads = total_threads
+        self.handle_imbalance = handle_imbalance
+        self.random_state = random_state
+        self.results = None
+        self.best_params = None
+        self.best_score = None
+    
+    def fit(self, X, y):
+        """Run the search on (X, y); returns the best parameters (n_estimators included)"""
+        X = np.ascontiguousarray(X, dtype='float32')
+        y = np.asarray(y, dtype='int64')
+        folds = list(StratifiedKFold(n_splits=self.cv, shuffle=True, random_state=self.random_state).split(X, y))
+        
+        configs = sample_configs(self.space, self.n_trials, self.random_state)
+        workers, n_jobs = thread_budget(len(configs), self.max_workers, self.total_threads)
+        print(f"\n🔎 Searching {len(configs)} configurations ({self.cv}-fold CV, "
+              f"{workers} workers x {n_jobs} XGBoost threads)")
+        
+        rows = []
+        survivors = list(range(len(configs)))
+        rounds = self.min_rounds
+        # Trials whose folds all stopped early would only repeat themselves with more rounds
+        converged = {}
+        with self._pool(workers, X, y, folds) as pool:
+            while True:
+                futures = {i: pool.submit(_run_trial, configs[i], rounds, self.early_stopping_rounds, n_jobs)
+                           for i in survivors if i not in converged}
+                scores = {i: converged[i] if i in converged else futures[i].result() for i in survivors}
+                for i, (loss, best_round, stopped) in scores.items():
+                    rows.append({'trial': i, 'rounds': rounds, 'mlogloss': loss,
+                                 'best_round': best_round, **configs[i]})
+                    if stopped:
+                        converged[i] = scores[i]
+                
+                ranked = sorted(survivors, key=lambda i: scores[i][0])
+                print(f"   {rounds} rounds: {len(survivors)} configurations "
+                      f"({len(futures)} trained), best mlogloss {scores[ranked[0]][0]:.4f}")
+                if rounds >= self.max_rounds:
+                    break
+                survivors = ranked[:max(1, math.ceil(len(ranked) / self.eta))]
+                # A lone survivor goes straight to the full budget
+                rounds = self.max_rounds if len(survivors) == 1 else min(rounds * self.eta, self.max_rounds)
+        
+        self.results = pd.DataFrame(rows)
+        final = self.results[self.results['rounds'] == rounds].sort_values('mlogloss').iloc[0]
+        best_trial = int(final['trial'])
+        self.best_score = float(final['mlogloss'])
+        self.best_params = {**configs[best_trial], 'n_estimators': int(final['best_round'])}
+        
+        print(f"✅ Best CV mlogloss {self.best_score:.4f}: {self.best_params}")
+        return self.best_params
+    
+    def save(self, path):
+        """Best parameters and their CV score as JSON"""
+        with open(path, 'w') as f:
+            json.dump({'params': self.best_params, 'cv_mlogloss': self.best_score,
+                       'cv_folds': self.cv, 'n_trials': self.n_trials}, f, indent=2)
+    
+    def _pool(self, workers, X, y, folds):
+        # A single worker runs in a thread: no process start-up or data transfer to pay for
+        executor = ThreadPoolExecutor if workers == 1 else ProcessPoolExecutor
+        return executor(max_workers=workers, initializer=_init_worker,
+                        initargs=(X, y, folds, self.handle_imbalance))
+
+
+def load_best_params(model_dir='models'):
+    """Persisted best parameters from model_dir, or None if no search has been saved"""
+    path = os.path.join(model_dir, BEST_PARAMS_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)['params']
@@ -7,6 +7,7 @@ OPTIMIZED FOR BATCH PROCESSING
 """
 # paste into a util file or at top of predict_analytics.py
 from feature_engineering import FeatureEngineer
+from preprocessing_artifact import PreprocessingArtifact, ARTIFACT_FILE, lookup_categories
 FEATURE_INFO = {
     "flag_low_attendance": {
         "label": "Low Attendance Flag",
@@ -80,6 +81,7 @@ import numpy as np
 import joblib
 import json
 import subprocess
+import os
 
 # SHAP import (optional)
 try:
@@ -159,14 +161,22 @@ class StudentAnalytics:
     def __init__(self, model_dir='models'):
         """Load trained model & preprocessors"""
         self.model = joblib.load(f'{model_dir}/dropout_model.pkl')
-        self.scaler = joblib.load(f'{model_dir}/scaler.pkl')
-        self.encoders = joblib.load(f'{model_dir}/encoders.pkl')
-        self.feature_names = joblib.load(f'{model_dir}/feature_names.pkl')
         self.label_mapping = {0: 'Low Risk', 1: 'Medium Risk', 2: 'High Risk'}
+        self.feature_engineer = FeatureEngineer(fused=True)
 
-        self.feature_engineer = FeatureEngineer()
-        self.feature_engineer.encoders = self.encoders
-        self.feature_engineer.scaler = self.scaler
+        artifact_path = f'{model_dir}/{ARTIFACT_FILE}'
+        if os.path.exists(artifact_path):
+            # NumPy lookup tables and scaling; no sklearn objects to unpickle
+            self.preprocessing = PreprocessingArtifact.load(artifact_path)
+            self.feature_names = self.preprocessing.feature_names
+        else:
+            # Model directories saved before the artifact existed
+            self.preprocessing = None
+            self.scaler = joblib.load(f'{model_dir}/scaler.pkl')
+            self.encoders = joblib.load(f'{model_dir}/encoders.pkl')
+            self.feature_names = joblib.load(f'{model_dir}/feature_names.pkl')
+            self.feature_engineer.encoders = self.encoders
+            self.feature_engineer.scaler = self.scaler
 
         # SHAP containers
         self.shap_explainer = None
@@ -226,36 +236,29 @@ class StudentAnalytics:
             print("⚠️ SHAP computation failed:", e)
             self.shap_values_list = None
 
-    def batch_predict(self, df):
-        """
-        Predict for multiple students.
-        Produces a list of JSON-serializable dicts with SHAP explanations (if available).
-        """
-        print(f"\n🔮 Processing {len(df)} students in batch mode...")
-
-        student_ids = df['student_id'].values
+    def _transform_with_artifact(self, df_processed):
+        """Model matrix via the NumPy preprocessing artifact"""
+        unknown = {}
+        matrix = self.preprocessing.transform(df_processed, unknown)
+        for col, values in unknown.items():
+            print(f"⚠️ Unseen labels in '{col}': {values[:10]} (encoded as unknown)")
 
-        print("🔧 Engineering features for all students...")
-        df_processed = self.feature_engineer.engineer_features(df.copy())
+        return pd.DataFrame(matrix, columns=self.feature_names)
 
+    def _transform_with_encoders(self, df_processed):
+        """Model matrix via the pickled LabelEncoders and StandardScaler"""
         # Prepare X with same feature order as training
         X = df_processed[self.feature_names].copy()
 
-        # Safe encoding for categorical features (handle unseen categories)
+        # Frozen encoding against the fitted classes (the encoders are never modified);
+        # unseen labels all get the reserved code len(classes_)
         categorical_cols = X.select_dtypes(include=['object']).columns.tolist()
         for col in categorical_cols:
             if col in self.encoders:
-                encoder = self.encoders[col]
-                # collect unique strings in this column
-                uniq = set(X[col].astype(str).unique())
-                known = set(encoder.classes_)
-                unseen = uniq - known
+                classes = np.asarray(self.encoders[col].classes_, dtype=str)
+                X[col], unseen = lookup_categories(X[col], classes)
                 if unseen:
-                    print(f"⚠️ Unseen labels in '{col}': {list(unseen)[:10]} (adding to encoder)")
-                    # extend encoder.classes_ (LabelEncoder-like)
-                    encoder.classes_ = np.append(encoder.classes_, list(unseen))
-                # transform
-                X[col] = encoder.transform(X[col].astype(str))
+                    print(f"⚠️ Unseen labels in '{col}': {sorted(unseen)[:10]} (encoded as unknown)")
 
         # Fill NaNs
         X.fillna(0, inplace=True)
@@ -266,6 +269,32 @@ class StudentAnalytics:
         X_scaled[numeric_cols] = self.scaler.transform(X[numeric_cols])
         # ensure tidy index
         X_scaled.reset_index(drop=True, inplace=True)
+        return X_scaled
+
+    def batch_predict(self, df, feature_store=None):
+        """
+        Predict for multiple students.
+        Produces a list of JSON-serializable dicts with SHAP explanations (if available).
+        Engineered features and the model matrix are read from feature_store when it
+        was materialized from the same df with this model's preprocessing.
+        """
+        print(f"\n🔮 Processing {len(df)} students in batch mode...")
+
+        student_ids = df['student_id'].values
+
+        if feature_store is not None and feature_store.is_current(df, matrix=True):
+            print("📦 Reading features from the feature store...")
+            df_processed = feature_store.read_engineered()
+            X_scaled = feature_store.read_matrix()
+        else:
+            print("🔧 Engineering features for all students...")
+            # Fused mode leaves df untouched (its columns are shared, not modified)
+            df_processed = self.feature_engineer.engineer_features(df)
+
+            if self.preprocessing is not None:
+                X_scaled = self._transform_with_artifact(df_processed)
+            else:
+                X_scaled = self._transform_with_encoders(df_processed)
 
         # Compute SHAP for the ENTIRE batch (if available)
         if SHAP_AVAILABLE:
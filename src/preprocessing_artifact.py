@@ -0,0 +1,108 @@
+"""
+PREPROCESSING ARTIFACT
+Feature order, category lookup tables and scaling as plain NumPy arrays in one
+versioned .npz, with a transform over raw arrays (no sklearn needed at inference)
+"""
+
+import numpy as np
+import pandas as pd
+
+ARTIFACT_VERSION = 1
+ARTIFACT_FILE = 'preprocessing.npz'
+
+
+def lookup_categories(values, categories):
+    """
+    Frozen label encoding: codes of values in a sorted category table (the
+    LabelEncoder codes, values compared as str) and the distinct values not in
+    it, which all get the reserved code len(categories)
+    
+    One hash pass factorizes the column; only its distinct values are looked up
+    in the table, so the cost is O(n) per column and the table is never changed.
+    """
+    row_codes, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=False)
+    uniques = np.asarray(uniques).astype(str)
+    
+    positions = np.searchsorted(categories, uniques)
+    found = positions < len(categories)
+    found[found] = categories[positions[found]] == uniques[found]
+    unique_codes = np.where(found, positions, len(categories))
+    
+    return unique_codes[row_codes], uniques[~found].tolist()
+
+
+def encode_categories(values, categories):
+    """Codes of values in a sorted category table; unknown values get len(categories)"""
+    return lookup_categories(values, categories)[0]
+
+
+class PreprocessingArtifact:
+    """
+    Everything between the engineered feature frame and the model matrix:
+    label-encode the categorical columns, fill NaN with 0, then standardize
+    every column (the same steps as DropoutModel.prepare_data)
+    """
+    
+    def __init__(self, feature_names, categories, mean, scale):
+        self.feature_names = list(feature_names)
+        # {column: sorted str array}; position in the table is the code
+        self.categories = categories
+        self.mean = np.asarray(mean, dtype='float64')
+        self.scale = np.asarray(scale, dtype='float64')
+    
+    @classmethod
+    def from_fitted(cls, feature_names, encoders, scaler):
+        """Build from the fitted LabelEncoders and StandardScaler of a training run"""
+        categories = {col: np.asarray(encoder.classes_, dtype=str) for col, encoder in encoders.items()
+                      if col in feature_names}
+        return cls(feature_names, categories, scaler.mean_, scaler.scale_)
+    
+    def save(self, path):
+        arrays = {
+            'version': np.array(ARTIFACT_VERSION),
+            'feature_names': np.asarray(self.feature_names, dtype=str),
+            'mean': self.mean,
+            'scale': self.scale
+        }
+        for col, table in self.categories.items():
+            arrays[f'categories:{col}'] = table
+        np.savez(path, **arrays)
+    
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data['version'])
+            if version != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported preprocessing artifact version {version} in {path}")
+            categories = {key.split(':', 1)[1]: data[key] for key in data.files if key.startswith('categories:')}
+            return cls(data['feature_names'].tolist(), categories, data['mean'], data['scale'])
+    
+    def transform(self, data, unknown=None):
+        """
+        Model matrix (n_rows x n_features, float64) from raw columns: `data` maps each
+        feature name to a 1-D array, e.g. a DataFrame or a dict of NumPy arrays.
+        Pass a dict as `unknown` to collect {column: unseen labels} in the same pass.
+        """
+        n = len(data[self.feature_names[0]])
+        matrix = np.empty((n, len(self.feature_names)))
+        for j, col in enumerate(self.feature_names):
+            if col in self.categories:
+                matrix[:, j], missing = lookup_categories(data[col], self.categories[col])
+                if missing and unknown is not None:
+                    unknown[col] = sorted(missing)
+            else:
+                matrix[:, j] = np.asarray(data[col], dtype='float64')
+        
+        matrix[np.isnan(matrix)] = 0
+        matrix -= self.mean
+        matrix /= self.scale
+        return matrix
+    
+    def unknown_categories(self, data):
+        """{column: values not in its lookup table} for the categorical features in data"""
+        unknown = {}
+        for col, table in self.categories.items():
+            missing = lookup_categories(data[col], table)[1]
+            if missing:
+                unknown[col] = sorted(missing)
+        return unknown
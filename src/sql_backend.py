@@ -0,0 +1,329 @@
+"""
+SQL AGGREGATION BACKEND
+Runs the DataLoader aggregations inside an embedded SQL engine (SQLite, or DuckDB
+straight over the CSV/Parquet files) and pulls only per-student results into pandas
+"""
+
+import os
+import json
+import sqlite3
+import pandas as pd
+
+# Optional: DuckDB queries the table files in place
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+
+# Table where import_tables records which files the database was built from
+IMPORT_METADATA_TABLE = 'import_metadata'
+
+
+def count_if(condition):
+    """Portable COUNT of rows matching a condition (BIGINT in both engines)"""
+    return f"CAST(SUM(CASE WHEN {condition} THEN 1 ELSE 0 END) AS BIGINT)"
+
+
+def _require_db_file(db_path):
+    # Every query opens its own connection, and each ':memory:' connection starts empty
+    if db_path == ':memory:':
+        raise ValueError("SQLiteBackend needs a database file, not ':memory:'")
+
+
+class SQLBackend:
+    """
+    Aggregation queries shared by the engines. Each query returns the same
+    per-student partial state as the pandas path (day counts, sums, sums of
+    squares, min/max, per-category counts) and the DataLoader _finalize_*
+    methods turn it into the usual feature columns.
+    
+    Subclasses implement connect() and relation(table_name).
+    """
+    
+    def __init__(self, loader):
+        self.loader = loader
+    
+    def connect(self):
+        raise NotImplementedError
+    
+    def relation(self, table_name):
+        """SQL expression to select a table from"""
+        raise NotImplementedError
+    
+    def query(self, sql):
+        connection = self.connect()
+        try:
+            return pd.read_sql_query(sql, connection)
+        finally:
+            connection.close()
+    
+    def read_table(self, table_name):
+        """A per-student base table, whole"""
+        return self.query(f"SELECT * FROM {self.relation(table_name)}")
+    
+    def _pivot_counts(self, table_name, column, prefix, value='COUNT(*)'):
+        """Per-student counts (or other aggregate) per value of a column, one column per value"""
+        counts = self.query(f"""
+            SELECT student_id, {column} AS key, {value} AS value
+            FROM {self.relation(table_name)}
+            WHERE {column} IS NOT NULL
+            GROUP BY student_id, {column}
+        """)
+        wide = counts.pivot(index='student_id', columns='key', values='value')
+        wide.columns = [f'{prefix}{key}' for key in wide.columns]
+        return wide
+    
+    def aggregate_attendance(self):
+        partials = self.query(f"""
+            SELECT student_id,
+                   COUNT(status) AS status_attendance_total_days,
+                   {count_if("status = 'Present'")} AS status_attendance_present_days,
+                   {count_if("status = 'Absent'")} AS status_attendance_absent_days,
+                   {count_if("week_number <= 4")} AS first_days,
+                   {count_if("week_number <= 4 AND status = 'Present'")} AS first_present,
+                   {count_if("NOT (week_number <= 4)")} AS second_days,
+                   {count_if("NOT (week_number <= 4) AND status = 'Present'")} AS second_present
+            FROM {self.relation('04_daily_attendance')}
+            GROUP BY student_id
+            ORDER BY student_id
+        """)
+        return self.loader._finalize_attendance(partials.set_index('student_id'))
+    
+    def aggregate_marks(self):
+        partials = self.query(f"""
+            SELECT student_id,
+                   COUNT(percentage) AS pct_count,
+                   SUM(percentage) AS pct_sum,
+                   SUM(percentage * percentage) AS pct_sumsq,
+                   MIN(percentage) AS pct_min,
+                   MAX(percentage) AS pct_max,
+                   SUM(obtained_marks) AS obtained_sum,
+                   {count_if("percentage < 40")} AS failing
+            FROM {self.relation('05_marks_exams')}
+            GROUP BY student_id
+            ORDER BY student_id
+        """).set_index('student_id')
+        
+        subject_sums = self._pivot_counts('05_marks_exams', 'subject', 'subject_sum:', 'SUM(percentage)')
+        subject_counts = self._pivot_counts('05_marks_exams', 'subject', 'subject_count:', 'COUNT(percentage)')
+        
+        return self.loader._finalize_marks(partials.join([subject_sums, subject_counts]))
+    
+    def aggregate_assignments(self):
+        partials = self.query(f"""
+            SELECT student_id,
+                   COUNT(*) AS assignments_total,
+                   {count_if("submitted = 'Yes'")} AS submitted,
+                   {count_if("status = 'Late'")} AS late
+            FROM {self.relation('06_assignments')}
+            GROUP BY student_id
+            ORDER BY student_id
+        """).set_index('student_id')
+        
+        grades = self._pivot_counts('06_assignments', 'grade', 'assignment_grade_')
+        return self.loader._finalize_assignments(partials.join(grades))
+    
+    def aggregate_behavior(self):
+        type_counts = self.query(f"""
+            SELECT student_id, behavior_type, COUNT(*) AS reports
+            FROM {self.relation('07_behavior_reports')}
+            WHERE behavior_type IS NOT NULL
+            GROUP BY student_id, behavior_type
+        """)
+        return self.loader._finalize_behavior(type_counts.set_index(['student_id', 'behavior_type'])['reports'])
+    
+    def aggregate_library(self):
+        partials = self.query(f"""
+            SELECT student_id,
+                   COUNT(visit_date) AS library_visits,
+                   SUM(duration_hours) AS library_hours
+            FROM {self.relation('08_library_usage')}
+            GROUP BY student_id
+            ORDER BY student_id
+        """)
+        return self.loader._finalize_library(partials.set_index('student_id'))
+    
+    def aggregate_fees(self):
+        # instr() rather than LIKE, which is case-insensitive in SQLite
+        partials = self.query(f"""
+            SELECT student_id,
+                   SUM(amount_paid) AS fee_total_paid,
+                   {count_if("instr(status, 'Pending') > 0")} AS fee_pending_count,
+                   {count_if("instr(status, 'Late') > 0")} AS fee_late_count
+            FROM {self.relation('09_fee_payments')}
+            GROUP BY student_id
+            ORDER BY student_id
+        """)
+        return self.loader._finalize_fees(partials.set_index('student_id'))
+    
+    def aggregate_extracurricular(self):
+        reg_df = self.query(f"""
+            SELECT student_id, total_activities, participation_status
+            FROM {self.relation('10_extracurricular_registrations')}
+        """)
+        
+        details = self.query(f"""
+            SELECT student_id,
+                   {count_if("role IN ('Coordinator', 'President/Head')")} AS extra_leadership_roles,
+                   AVG(hours_per_week) AS extra_hours_per_week,
+                   SUM(total_events_participated) AS extra_total_events
+            FROM {self.relation('11_extracurricular_details')}
+            GROUP BY student_id
+            ORDER BY student_id
+        """).set_index('student_id')
+        
+        session_counts = self.query(f"""
+            SELECT student_id,
+                   COUNT(attendance_status) AS attendance_status_extra_sessions_total,
+                   {count_if("attendance_status = 'Present'")} AS attendance_status_extra_sessions_present
+            FROM {self.relation('12_extracurricular_attendance')}
+            GROUP BY student_id
+            ORDER BY student_id
+        """).set_index('student_id')
+        
+        parts = []
+        if not details.empty:
+            categories = self._pivot_counts('11_extracurricular_details', 'activity_category', 'extra_category_')
+            parts += [categories.fillna(0).astype('int64'), details]
+        if not session_counts.empty:
+            parts.append(self.loader._extra_attendance_rate(session_counts))
+        
+        return self.loader._finalize_extracurricular(reg_df, parts)
+
+
+class SQLiteBackend(SQLBackend):
+    """
+    Aggregates a SQLite database with one table per dummy_data table, named
+    without the numeric prefix (as written by generate_complete_synchronized_data.py --sqlite)
+    
+    The database file must already exist: build it with import_tables (which
+    make_backend does for a missing path) or the generator's --sqlite option.
+    In-memory (:memory:) databases are not supported.
+    
+    import_tables records the source data_dir and the size and mtime of each
+    table file in IMPORT_METADATA_TABLE; make_backend re-imports when they no
+    longer match the loader's files.
+    """
+    
+    def __init__(self, loader, db_path='data/dummy_data.db'):
+        super().__init__(loader)
+        _require_db_file(db_path)
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"SQLite database not found: {db_path} (create it with "
+                                    f"SQLiteBackend.import_tables or generate_complete_synchronized_data.py --sqlite)")
+        self.db_path = db_path
+    
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+    
+    def relation(self, table_name):
+        return table_name.split('_', 1)[1]
+    
+    @staticmethod
+    def source_fingerprint(loader):
+        """The loader's data_dir and table file fingerprints, as recorded by import_tables"""
+        return json.dumps({'data_dir': os.path.abspath(loader.data_dir),
+                           'inputs': loader._input_fingerprints()}, sort_keys=True)
+    
+    def stored_fingerprint(self):
+        """
+        source_fingerprint of the import this database came from: None if it was not
+        built by import_tables (e.g. written by the generator), '' if that import did not finish
+        """
+        connection = self.connect()
+        try:
+            row = connection.execute(f"SELECT fingerprint FROM {IMPORT_METADATA_TABLE}").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        finally:
+            connection.close()
+        return row[0] if row else ''
+    
+    @classmethod
+    def import_tables(cls, loader, db_path, chunksize=100000):
+        """
+        Load the loader's CSV/Parquet tables into a SQLite database chunk by chunk
+        (only the columns DataLoader uses), indexed by student_id
+        """
+        from table_schemas import TABLE_SCHEMAS
+        
+        _require_db_file(db_path)
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        fingerprint = cls.source_fingerprint(loader)
+        connection = sqlite3.connect(db_path)
+        try:
+            # An empty metadata table marks an import in progress, so an interrupted one never matches
+            connection.execute(f"DROP TABLE IF EXISTS {IMPORT_METADATA_TABLE}")
+            connection.execute(f"CREATE TABLE {IMPORT_METADATA_TABLE} (fingerprint TEXT)")
+            connection.commit()
+            for table_name in TABLE_SCHEMAS:
+                name = table_name.split('_', 1)[1]
+                connection.execute(f"DROP TABLE IF EXISTS {name}")
+                for chunk in loader._iter_table_chunks(table_name, chunksize):
+                    chunk.to_sql(name, connection, if_exists='append', index=False)
+                connection.execute(f"CREATE INDEX idx_{name}_student_id ON {name} (student_id)")
+            connection.execute(f"INSERT INTO {IMPORT_METADATA_TABLE} VALUES (?)", (fingerprint,))
+            connection.commit()
+        finally:
+            connection.close()
+        
+        return cls(loader, db_path)
+
+
+class DuckDBBackend(SQLBackend):
+    """Aggregates the CSV/Parquet files in the loader's data_dir in place with DuckDB"""
+    
+    def __init__(self, loader):
+        if not DUCKDB_AVAILABLE:
+            raise ImportError("duckdb is not installed (pip install duckdb)")
+        super().__init__(loader)
+    
+    def connect(self):
+        return duckdb.connect()
+    
+    def query(self, sql):
+        connection = self.connect()
+        try:
+            return connection.execute(sql).df()
+        finally:
+            connection.close()
+    
+    def relation(self, table_name):
+        path, ext = self.loader._table_path(table_name)
+        path = path.replace("'", "''")
+        if ext == '.parquet':
+            return f"read_parquet('{path}')"
+        return f"read_csv_auto('{path}')"
+    
+    def read_table(self, table_name):
+        # DuckDB would type the date columns as DATE; the typed pandas read keeps them as strings
+        return self.loader._read_table(table_name)
+
+
+def make_backend(loader, spec):
+    """
+    Backend from a spec string: 'sqlite:<db_path>' or 'duckdb'. A SQLite
+    database is (re)built from the loader's tables when it does not exist yet or
+    was imported from other files (different data_dir, or tables changed since).
+    """
+    engine, _, target = spec.partition(':')
+    if engine == 'sqlite':
+        db_path = target or 'data/dummy_data.db'
+        if db_path != ':memory:' and not os.path.exists(db_path):
+            print(f"🗄️ Importing {loader.data_dir} into {db_path}...")
+            return SQLiteBackend.import_tables(loader, db_path)
+        
+        backend = SQLiteBackend(loader, db_path)
+        stored = backend.stored_fingerprint()
+        if stored is None:
+            print(f"⚠️ {db_path} has no import metadata; it cannot be checked against {loader.data_dir}")
+        elif stored != SQLiteBackend.source_fingerprint(loader):
+            print(f"♻️ {db_path} was imported from other files; re-importing {loader.data_dir}...")
+            return SQLiteBackend.import_tables(loader, db_path)
+        return backend
+    if engine == 'duckdb':
+        return DuckDBBackend(loader)
+    raise ValueError(f"Unknown SQL backend {spec!r}, expected 'sqlite:<db_path>' or 'duckdb'")
@@ -0,0 +1,203 @@
+"""
+TABLE SCHEMAS
+Explicit column dtypes for the 12 dummy_data tables
+Shared by the data generator (typed Parquet output) and DataLoader (typed, column-pruned reads)
+"""
+
+import pandas as pd
+
+
+# Columns not listed keep their default dtype. Dates are stored as 'YYYY-MM-DD'
+# strings (never null); they are declared as str so typed CSV engines don't turn them into timestamps
+TABLE_SCHEMAS = {
+    '01_students_master': {
+        'student_id': 'int32',
+        'gender': 'category',
+        'age': 'int16',
+        'date_of_birth': 'str',
+        # CSV readers have always parsed the +91 numbers as integers
+        'phone': 'int64',
+        'city': 'category',
+        'location_type': 'category',
+        'branch': 'category',
+        'branch_name': 'category',
+        'year': 'int8',
+        'semester': 'int8',
+        'admission_date': 'str',
+        'status': 'category',
+        'primary_teacher_id': 'int32',
+        'class_coordinator': 'category'
+    },
+    '02_family_background': {
+        'student_id': 'int32',
+        'income_level': 'category',
+        'annual_income': 'int64',
+        'father_education': 'category',
+        'father_occupation': 'category',
+        'mother_education': 'category',
+        'mother_occupation': 'category',
+        'siblings': 'int8',
+        'family_size': 'int8',
+        'single_parent': 'int8',
+        'guardian_contact': 'int64'
+    },
+    '03_academic_history': {
+        'student_id': 'int32',
+        'current_semester_gpa': 'float64',
+        'previous_semester_gpa': 'float64',
+        'cumulative_gpa': 'float64',
+        'gpa_trend': 'category',
+        'credits_registered_current': 'int16',
+        'credits_completed_current': 'int16',
+        'total_credits_registered': 'int16',
+        'total_credits_completed': 'int16',
+        'credit_completion_rate': 'float64',
+        'first_year_gpa': 'float64',
+        'first_year_credits_completed': 'int16',
+        'first_year_attendance_percent': 'float64',
+        'first_year_dropout_risk': 'category',
+        'registration_date': 'str',
+        'registration_delay_days': 'int16',
+        'registration_status': 'category',
+        'courses_withdrawn_ever': 'int8',
+        'courses_withdrawn_current': 'int8',
+        'total_course_withdrawals': 'int8',
+        'semester_number': 'int8',
+        'courses_failed_ever': 'int8',
+        'courses_repeated': 'int8',
+        'academic_standing': 'category',
+        'probation_status': 'category'
+    },
+    '04_daily_attendance': {
+        'student_id': 'int32',
+        'date': 'category',
+        'day_of_week': 'category',
+        'week_number': 'int8',
+        'status': 'category',
+        'marked_by': 'category',
+        'marked_at': 'category'
+    },
+    '05_marks_exams': {
+        'student_id': 'int32',
+        'subject': 'category',
+        'exam_type': 'category',
+        'max_marks': 'int16',
+        'obtained_marks': 'float64',
+        'percentage': 'float64',
+        'exam_date': 'category',
+        'evaluator': 'category'
+    },
+    '06_assignments': {
+        'student_id': 'int32',
+        'assignment_name': 'category',
+        'assigned_date': 'category',
+        'due_date': 'category',
+        'submitted': 'category',
+        'status': 'category',
+        'grade': 'category',
+        'feedback': 'category'
+    },
+    '07_behavior_reports': {
+        'student_id': 'int32',
+        'behavior_type': 'category',
+        'behavior': 'category',
+        'description': 'category',
+        'reported_by': 'category',
+        'severity': 'category'
+    },
+    '08_library_usage': {
+        'student_id': 'int32',
+        'visit_date': 'str',
+        'activity': 'category',
+        'book_title': 'category',
+        'duration_hours': 'float32'
+    },
+    '09_fee_payments': {
+        'student_id': 'int32',
+        'installment': 'category',
+        'amount_due': 'int32',
+        'due_date': 'category',
+        'amount_paid': 'int32',
+        'status': 'category',
+        'payment_method': 'category'
+    },
+    '10_extracurricular_registrations': {
+        'student_id': 'int32',
+        'total_activities': 'int8',
+        'participation_status': 'category'
+    },
+    '11_extracurricular_details': {
+        'student_id': 'int32',
+        'activity_name': 'category',
+        'activity_category': 'category',
+        'role': 'category',
+        'activity_level': 'category',
+        'hours_per_week': 'int16',
+        'total_events_participated': 'int16',
+        'achievement': 'category',
+        'status': 'category',
+        'faculty_coordinator': 'category'
+    },
+    '12_extracurricular_attendance': {
+        'student_id': 'int32',
+        'activity_name': 'category',
+        'session_date': 'category',
+        'session_type': 'category',
+        'session_time': 'category',
+        'duration_hours': 'float32',
+        'attendance_status': 'category',
+        'marked_by': 'category'
+    }
+}
+
+
+# Columns DataLoader actually uses from each table (None = every column, because the
+# base tables flow straight into the master dataset)
+LOADER_COLUMNS = {
+    '01_students_master': None,
+    '02_family_background': None,
+    '03_academic_history': None,
+    '04_daily_attendance': ['student_id', 'week_number', 'status'],
+    '05_marks_exams': ['student_id', 'subject', 'obtained_marks', 'percentage'],
+    '06_assignments': ['student_id', 'submitted', 'status', 'grade'],
+    '07_behavior_reports': ['student_id', 'behavior_type'],
+    '08_library_usage': ['student_id', 'visit_date', 'duration_hours'],
+    '09_fee_payments': ['student_id', 'amount_paid', 'status'],
+    '10_extracurricular_registrations': ['student_id', 'total_activities', 'participation_status'],
+    '11_extracurricular_details': ['student_id', 'activity_category', 'role',
+                                   'hours_per_week', 'total_events_participated'],
+    '12_extracurricular_attendance': ['student_id', 'attendance_status']
+}
+
+
+def read_options(table_name, extra_columns=()):
+    """usecols and dtype arguments for reading one table as the loader needs it"""
+    usecols = LOADER_COLUMNS[table_name]
+    if usecols is not None and extra_columns:
+        usecols = usecols + [col for col in extra_columns if col not in usecols]
+    dtype = {col: dtype for col, dtype in TABLE_SCHEMAS[table_name].items()
+             if usecols is None or col in usecols}
+    return usecols, dtype
+
+
+def apply_schema(df, table_name):
+    """Cast the columns of one table to its declared dtypes"""
+    schema = TABLE_SCHEMAS[table_name]
+    return df.astype({col: dtype for col, dtype in schema.items() if col in df.columns})
+
+
+def to_pipeline_dtypes(df):
+    """
+    Widen compact dtypes back to what an untyped pd.read_csv produces
+    (category -> object, ints -> int64, floats -> float64), so downstream
+    feature selection and encoding see the same frame whatever the source format
+    """
+    casts = {}
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            casts[col] = object
+        elif pd.api.types.is_integer_dtype(dtype) and dtype != 'int64':
+            casts[col] = 'int64'
+        elif pd.api.types.is_float_dtype(dtype) and dtype != 'float64':
+            casts[col] = 'float64'
+    return df.astype(casts) if casts else df
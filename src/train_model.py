@@ -5,7 +5,7 @@ Train XGBoost classifier for dropout prediction with hyperparameter tuning
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, accuracy_score
 from xgboost import XGBClassifier
 from imblearn.over_sampling import SMOTE
@@ -17,33 +17,48 @@ import os
 warnings.filterwarnings('ignore')
 
 from feature_engineering import FeatureEngineer
+from preprocessing_artifact import PreprocessingArtifact, ARTIFACT_FILE
+from hyperparameter_search import (HyperparameterSearch, BASE_PARAMS, DEFAULT_PARAMS,
+                                   BEST_PARAMS_FILE, load_best_params)
+from hist_training import DEFAULT_BATCH_ROWS, chunk_batches, balanced_class_weights, train_hist
+from drift import DriftReference, DRIFT_FILE
 
 
 class DropoutModel:
     def __init__(self):
         self.model = None
-        self.feature_engineer = FeatureEngineer()
+        self.feature_engineer = FeatureEngineer(fused=True)
         self.feature_names = None
+        self.engineered_df = None
+        self.split_index = None
+        # Tuned XGBoost parameters (from tune=True or load_best_params); None trains with DEFAULT_PARAMS
+        self.best_params = None
+        self.search = None
+        # Feature distributions of the last full training run (the warm-start drift guard compares against it)
+        self.drift_reference = None
         self.label_mapping = {'Low Risk': 0, 'Medium Risk': 1, 'High Risk': 2}
         
-    def prepare_data(self, df):
-        """Prepare data for training"""
+    def prepare_data(self, df, feature_store=None):
+        """Prepare data for training (engineered features come from feature_store when it is current for df)"""
         print("\n" + "="*80)
         print("📊 DATA PREPARATION")
         print("="*80)
         
         # Engineer features
-        df = self.feature_engineer.engineer_features(df)
+        if feature_store is not None and feature_store.is_current(df):
+            print("📦 Using engineered features from the feature store")
+            df = feature_store.read_engineered()
+        else:
+            df = self.feature_engineer.engineer_features(df)
+        # Kept for materializing the feature store after training
+        self.engineered_df = df
         
         # Select features
         feature_cols = self._select_features(df)
         
-        # Encode target
-        df['dropout_risk_encoded'] = df['dropout_risk'].map(self.label_mapping)
-        
-        # Separate features and target
+        # Separate features and target (the target is not added to the engineered frame)
         X = df[feature_cols]
-        y = df['dropout_risk_encoded']
+        y = df['dropout_risk'].map(self.label_mapping).rename('dropout_risk_encoded')
         
         # Encode categorical features
         categorical_cols = X.select_dtypes(include=['object']).columns.tolist()
@@ -86,18 +101,44 @@ class DropoutModel:
         
         return feature_cols
     
-    def train(self, X, y, test_size=0.2, handle_imbalance=True):
-        """Train the model"""
+    def split_data(self, X, y, test_size=0.2, valid_size=0.0):
+        """
+        Stratified train/test split; records the row positions of each split in
+        self.split_index. With valid_size, that fraction of the training split is
+        held out again as a 'valid' split (for early stopping) and left out of X_train.
+        """
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=42, stratify=y
+        )
+        # Row positions of each split in X (for the feature store's training matrix)
+        self.split_index = {'train': X.index.get_indexer(X_train.index), 'test': X.index.get_indexer(X_test.index)}
+        if valid_size:
+            X_train, X_valid, y_train, y_valid = train_test_split(
+                X_train, y_train, test_size=valid_size, random_state=42, stratify=y_train
+            )
+            self.split_index['train'] = X.index.get_indexer(X_train.index)
+            self.split_index['valid'] = X.index.get_indexer(X_valid.index)
+        return X_train, X_test, y_train, y_test
+    
+    def train(self, X, y, test_size=0.2, handle_imbalance=True, tune=False, search=None):
+        """
+        Train the model. With tune=True a HyperparameterSearch (or the one passed
+        as `search`) picks the parameters by cross-validation on the training split.
+        """
         print("\n" + "="*80)
         print("🎯 MODEL TRAINING")
         print("="*80)
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=test_size, random_state=42, stratify=y
-        )
+        X_train, X_test, y_train, y_test = self.split_data(X, y, test_size)
         
         print(f"\n📊 Train size: {len(X_train)}, Test size: {len(X_test)}")
+        self.drift_reference = DriftReference.from_matrix(X_train)
+        
+        # Tune on the training split (SMOTE is applied inside each CV fold)
+        if tune:
+            self.search = search or HyperparameterSearch(handle_imbalance=handle_imbalance)
+            self.best_params = self.search.fit(X_train, y_train)
         
         # Handle class imbalance with SMOTE
         if handle_imbalance:
@@ -109,17 +150,7 @@ class DropoutModel:
         # Train XGBoost
         print("\n🚀 Training XGBoost Classifier...")
         
-        self.model = XGBClassifier(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            objective='multi:softmax',
-            num_class=3,
-            random_state=42,
-            eval_metric='mlogloss'
-        )
+        self.model = XGBClassifier(**BASE_PARAMS, **(self.best_params or DEFAULT_PARAMS))
         
         self.model.fit(
             X_train, y_train,
@@ -132,6 +163,153 @@ class DropoutModel:
         
         return X_test, y_test
     
+    def train_hist(self, feature_store, batch_rows=DEFAULT_BATCH_ROWS, external_memory=False,
+                   cache_dir='data/xgb_cache', early_stopping_rounds=20, max_bin=256, n_jobs=None):
+        """
+        Train from the feature store's memory-mapped training matrix in batches:
+        QuantileDMatrix (or ExtMemQuantileDMatrix with external_memory=True, paging
+        to cache_dir), tree_method='hist', early stopping on the 'valid' split so
+        the test split stays unseen until the final evaluation. Balanced class
+        weights replace SMOTE, which needs the whole matrix in memory.
+        """
+        print("\n" + "="*80)
+        print(f"🎯 MODEL TRAINING (hist, {'external memory' if external_memory else 'quantile DMatrix'})")
+        print("="*80)
+        
+        X_train, y_train = feature_store.read_training('train')
+        X_valid, y_valid = feature_store.read_training('valid')
+        X_test, y_test = feature_store.read_training('test')
+        if len(y_valid) == 0 or len(y_test) == 0:
+            raise ValueError("The feature store's training matrix needs valid and test splits; "
+                             "write it with the split_index of split_data(X, y, valid_size=...)")
+        self.feature_names = X_train.columns.tolist()
+        self.drift_reference = DriftReference.from_matrix(X_train)
+        
+        train_batches = chunk_batches(X_train.values, y_train, batch_rows)
+        valid_batches = chunk_batches(X_valid.values, y_valid, batch_rows)
+        print(f"\n📊 Train size: {len(y_train)}, Validation size: {len(y_valid)}, Test size: {len(y_test)} "
+              f"({len(train_batches)} + {len(valid_batches)} batches of up to {batch_rows} rows)")
+        
+        class_weights = balanced_class_weights(train_batches, BASE_PARAMS['num_class'])
+        print("\n🚀 Training XGBoost (hist)...")
+        self.model = train_hist(train_batches, valid_batches, self.feature_names, self.best_params,
+                                class_weights, early_stopping_rounds, max_bin, external_memory,
+                                cache_dir, n_jobs)
+        
+        self._evaluate(X_test, y_test)
+        return X_test, y_test
+    
+    def retrain(self, df, model_dir='models', feature_store=None, new_rounds=50, max_psi=0.25,
+                max_unseen_rate=0.01, test_size=0.2, handle_imbalance=True):
+        """
+        Continue boosting the model saved in model_dir with new_rounds more trees,
+        fitted on the rows of df that are new or updated since feature_store was
+        written (every row without a store). Features go through the saved
+        preprocessing, so the existing trees keep seeing the same inputs.
+        
+        Falls back to full training (prepare_data + train) when there is no saved
+        model, the feature columns changed, more than max_unseen_rate of the rows
+        of a categorical column have unseen labels, or any feature's PSI against
+        the last full training run exceeds max_psi.
+        
+        Returns X, y (every row of df) and X_test, y_test.
+        """
+        X, y, reason = self._prepare_warm_start(df, model_dir, feature_store, max_psi, max_unseen_rate)
+        if reason is not None:
+            print(f"\n↩️ Full retraining: {reason}")
+            X, y = self.prepare_data(df, feature_store)
+            X_test, y_test = self.train(X, y, test_size, handle_imbalance)
+            return X, y, X_test, y_test
+        
+        print("\n" + "="*80)
+        print("🔁 WARM-START RETRAINING")
+        print("="*80)
+        
+        previous = joblib.load(f'{model_dir}/dropout_model.pkl')
+        changed = np.ones(len(X), dtype=bool) if feature_store is None else feature_store.changed_rows(df)
+        positions = np.flatnonzero(changed)
+        if len(positions) == 0:
+            print("\n✅ No new or updated rows; keeping the current model")
+            self.model = previous
+            self.split_index = None
+            return X, y, X.iloc[:0], y.iloc[:0]
+        
+        X_new, y_new = X.iloc[positions], y.iloc[positions]
+        try:
+            X_train, X_test, y_train, y_test = self.split_data(X_new, y_new, test_size)
+            # split_data positions are within X_new; the feature store needs them within X
+            self.split_index = {name: positions[rows] for name, rows in self.split_index.items()}
+        except ValueError:
+            # Too few rows of some class to stratify: fit on all of them, evaluate in-sample
+            print("\n⚠️ Too few new rows for a stratified split; evaluating on the training rows")
+            X_train, X_test, y_train, y_test = X_new, X_new, y_new, y_new
+            self.split_index = {'train': positions, 'test': positions[:0]}
+        print(f"\n📊 New/updated rows: {len(positions)} of {len(X)} "
+              f"(train {len(X_train)}, test {len(X_test)})")
+        
+        if handle_imbalance:
+            try:
+                X_train, y_train = SMOTE(random_state=42).fit_resample(X_train, y_train)
+            except ValueError as e:
+                print(f"⚠️ SMOTE skipped: {e}")
+        
+        params = {**BASE_PARAMS, **(self.best_params or load_best_params(model_dir) or DEFAULT_PARAMS)}
+        params['n_estimators'] = new_rounds
+        self.model = XGBClassifier(**params)
+        self.model.fit(X_train, y_train, eval_set=[(X_test, y_test)], verbose=False,
+                       xgb_model=previous.get_booster())
+        print(f"\n🚀 Boosted {previous.get_booster().num_boosted_rounds()} -> "
+              f"{self.model.get_booster().num_boosted_rounds()} rounds")
+        
+        self._evaluate(X_test, y_test)
+        return X, y, X_test, y_test
+    
+    def _prepare_warm_start(self, df, model_dir, feature_store, max_psi, max_unseen_rate):
+        """Model matrix of df under the saved preprocessing, or (None, None, reason to retrain fully)"""
+        required = ['dropout_model.pkl', 'encoders.pkl', 'scaler.pkl', ARTIFACT_FILE, DRIFT_FILE]
+        missing = [name for name in required if not os.path.exists(os.path.join(model_dir, name))]
+        if missing:
+            return None, None, f"no saved {', '.join(missing)} in {model_dir}"
+        artifact = PreprocessingArtifact.load(f'{model_dir}/{ARTIFACT_FILE}')
+        
+        if feature_store is not None and feature_store.is_current(df):
+            engineered = feature_store.read_engineered()
+        else:
+            engineered = self.feature_engineer.engineer_features(df)
+        
+        # Schema guard: the saved trees only know the saved feature columns
+        feature_cols = self._select_features(engineered)
+        added = sorted(set(feature_cols) - set(artifact.feature_names))
+        removed = sorted(set(artifact.feature_names) - set(feature_cols))
+        if added or removed:
+            return None, None, f"feature schema changed (added {added[:5]}, removed {removed[:5]})"
+        
+        unknown = {}
+        X = pd.DataFrame(artifact.transform(engineered, unknown), columns=artifact.feature_names,
+                         index=engineered.index)
+        for col, labels in unknown.items():
+            rate = engineered[col].astype(str).isin(labels).mean()
+            if rate > max_unseen_rate:
+                return None, None, f"{rate:.1%} of '{col}' has unseen labels {labels[:5]}"
+        
+        # Drift guard against the last full training run
+        reference = DriftReference.load(f'{model_dir}/{DRIFT_FILE}')
+        if reference.feature_names != artifact.feature_names:
+            return None, None, "drift reference does not match the saved features"
+        psi = reference.psi(X)
+        worst = int(np.argmax(psi))
+        print(f"\n📈 Max feature PSI {psi[worst]:.3f} ({artifact.feature_names[worst]})")
+        if psi[worst] > max_psi:
+            return None, None, f"'{artifact.feature_names[worst]}' drifted (PSI {psi[worst]:.3f} > {max_psi})"
+        
+        # Keep the saved preprocessing; save_model writes it back unchanged
+        self.engineered_df = engineered
+        self.feature_names = artifact.feature_names
+        self.feature_engineer.encoders = joblib.load(f'{model_dir}/encoders.pkl')
+        self.feature_engineer.scaler = joblib.load(f'{model_dir}/scaler.pkl')
+        y = engineered['dropout_risk'].map(self.label_mapping).rename('dropout_risk_encoded')
+        return X, y, None
+    
     def _evaluate(self, X_test, y_test):
         """Evaluate model performance"""
         print("\n" + "="*80)
@@ -148,11 +326,13 @@ class DropoutModel:
         # Classification Report
         print("\n📋 Classification Report:")
         target_names = ['Low Risk', 'Medium Risk', 'High Risk']
-        print(classification_report(y_test, y_pred, target_names=target_names))
+        # Fixed labels: a small (e.g. warm-start) test split may lack a class
+        labels = list(range(len(target_names)))
+        print(classification_report(y_test, y_pred, labels=labels, target_names=target_names, zero_division=0))
         
         # Confusion Matrix
         print("\n🔢 Confusion Matrix:")
-        cm = confusion_matrix(y_test, y_pred)
+        cm = confusion_matrix(y_test, y_pred, labels=labels)
         print(cm)
         
         # ROC-AUC (one-vs-rest)
@@ -192,20 +372,75 @@ class DropoutModel:
         os.makedirs(output_dir, exist_ok=True)
         
         joblib.dump(self.model, f'{output_dir}/dropout_model.pkl')
+        self.save_preprocessing(output_dir)
+        if self.search is not None:
+            self.search.save(f'{output_dir}/{BEST_PARAMS_FILE}')
+        # Warm starts leave the reference of the last full training run in place
+        if self.drift_reference is not None:
+            self.drift_reference.save(f'{output_dir}/{DRIFT_FILE}')
+        
+        print(f"\n💾 Model saved to {output_dir}/")
+    
+    def save_preprocessing(self, output_dir='models'):
+        """Save the fitted encoders, scaler and feature order (needs prepare_data, not a trained model)"""
+        os.makedirs(output_dir, exist_ok=True)
         self.feature_engineer.save_preprocessors(output_dir)
         joblib.dump(self.feature_names, f'{output_dir}/feature_names.pkl')
         
-        print(f"\n💾 Model saved to {output_dir}/")
+        # NumPy-only copy of the preprocessing for inference
+        artifact = PreprocessingArtifact.from_fitted(
+            self.feature_names, self.feature_engineer.encoders, self.feature_engineer.scaler
+        )
+        artifact.save(f'{output_dir}/{ARTIFACT_FILE}')
 
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Train the dropout model')
+    parser.add_argument('--tune', action='store_true', help='Run the hyperparameter search first')
+    parser.add_argument('--trials', type=int, default=27)
+    parser.add_argument('--workers', type=int, default=None, help='Search processes (default: one per core)')
+    parser.add_argument('--threads', type=int, default=None, help='Total thread budget (default: every core)')
+    parser.add_argument('--use-best-params', action='store_true',
+                        help=f'Train with models/{BEST_PARAMS_FILE} from an earlier search')
+    parser.add_argument('--hist', action='store_true',
+                        help='Stream the feature store matrix into a QuantileDMatrix (tree_method=hist)')
+    parser.add_argument('--external-memory', action='store_true',
+                        help='With --hist, page the binned matrix to disk (ExtMemQuantileDMatrix)')
+    parser.add_argument('--batch-rows', type=int, default=DEFAULT_BATCH_ROWS)
+    parser.add_argument('--warm-start', action='store_true',
+                        help='Add trees to models/dropout_model.pkl for new/updated rows (falls back to full training)')
+    args = parser.parse_args()
+    
     # Load processed data
     df = pd.read_csv('processed_data.csv')
     
     # Initialize and train
     model = DropoutModel()
-    X, y = model.prepare_data(df)
-    X_test, y_test = model.train(X, y)
-    model.save_model()
+    if args.use_best_params:
+        model.best_params = load_best_params('models')
+    if args.warm_start:
+        from feature_store import FeatureStore
+        feature_store = FeatureStore(store_dir='models/feature_store', model_dir='models')
+        X, y, X_test, y_test = model.retrain(df, 'models', feature_store)
+        model.save_model()
+        feature_store.write(df, model.engineered_df, X, y, model.split_index)
+    elif args.hist:
+        from feature_store import FeatureStore
+        X, y = model.prepare_data(df)
+        # Early stopping needs rows of its own, apart from the test split
+        model.split_data(X, y, valid_size=0.1)
+        # The store records the preprocessing its matrix was scaled with, so save that first
+        model.save_preprocessing('models')
+        feature_store = FeatureStore(store_dir='models/feature_store', model_dir='models')
+        feature_store.write(df, model.engineered_df, X, y, model.split_index)
+        X_test, y_test = model.train_hist(feature_store, args.batch_rows, args.external_memory)
+        model.save_model()
+    else:
+        X, y = model.prepare_data(df)
+        search = HyperparameterSearch(n_trials=args.trials, max_workers=args.workers, total_threads=args.threads)
+        X_test, y_test = model.train(X, y, tune=args.tune, search=search)
+        model.save_model()
     
     print("\n🎉 Training complete!")
\ No newline at end of file
@@ -0,0 +1,21 @@
+import io
+import os
+import sys
+import contextlib
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(scope='session')
+def dummy_data_dir(tmp_path_factory):
+    """A small seeded dataset (about 260 students, every risk class present)"""
+    from generate_complete_synchronized_data import CompleteSynchronizedDataGenerator
+    
+    output_dir = str(tmp_path_factory.mktemp('dummy_data'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        CompleteSynchronizedDataGenerator(seed=7, vectorized=True, scale_factor=0.3).generate_all_data(output_dir)
+    return output_dir
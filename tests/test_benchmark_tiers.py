@@ -0,0 +1,55 @@
+import os
+import json
+import io
+import contextlib
+
+import pandas as pd
+import pytest
+
+import generate_complete_synchronized_data as generator_module
+
+
+@pytest.fixture
+def small_tiers(monkeypatch):
+    # One tier on each side of the sharding threshold, at test-sized scale factors
+    monkeypatch.setattr(generator_module, 'BENCHMARK_TIERS', {'small': 0.05, 'large': 0.1})
+    monkeypatch.setattr(generator_module, 'SHARDED_TIER_MIN_SCALE_FACTOR', 0.1)
+    monkeypatch.setattr(generator_module, 'SHARDED_TIER_BLOCK_SIZE', 40)
+
+
+def test_large_tiers_are_generated_sharded(tmp_path, small_tiers):
+    with contextlib.redirect_stdout(io.StringIO()):
+        output_dirs = generator_module.generate_benchmark_tiers(base_dir=str(tmp_path), max_workers=1)
+    
+    small, large = output_dirs['small'], output_dirs['large']
+    assert not os.path.exists(os.path.join(small, 'manifest.json'))
+    assert os.path.exists(os.path.join(large, 'manifest.json'))
+    
+    # Shard parts are combined into the same single-file layout as the in-memory tiers
+    for output_dir in (small, large):
+        students = pd.read_csv(os.path.join(output_dir, '01_students_master.csv'))
+        attendance = pd.read_csv(os.path.join(output_dir, '04_daily_attendance.csv'))
+        assert set(attendance['student_id']) <= set(students['student_id'])
+    assert len(pd.read_csv(os.path.join(large, '01_students_master.csv'))) > 40
+
+
+def test_output_format_is_passed_to_in_memory_tiers(tmp_path, small_tiers):
+    with contextlib.redirect_stdout(io.StringIO()):
+        output_dirs = generator_module.generate_benchmark_tiers(['small'], base_dir=str(tmp_path),
+                                                                output_format='parquet')
+    assert os.path.exists(os.path.join(output_dirs['small'], '01_students_master.parquet'))
+
+
+def test_parquet_is_rejected_for_sharded_tiers_before_generating(tmp_path, small_tiers):
+    with pytest.raises(ValueError, match='large'):
+        generator_module.generate_benchmark_tiers(['small', 'large'], base_dir=str(tmp_path),
+                                                  output_format='parquet')
+    assert os.listdir(tmp_path) == []
+
+
+def test_vectorized_is_passed_to_sharded_tiers(tmp_path, small_tiers):
+    with contextlib.redirect_stdout(io.StringIO()):
+        output_dirs = generator_module.generate_benchmark_tiers(['large'], base_dir=str(tmp_path),
+                                                                vectorized=False, max_workers=1)
+    with open(os.path.join(output_dirs['large'], 'manifest.json')) as f:
+        assert json.load(f)['vectorized'] is False
@@ -0,0 +1,40 @@
+import os
+import sqlite3
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_cors')
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dashboards', 'backend')
+
+
+class TrackedConnection(sqlite3.Connection):
+    opened = []
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.closed = False
+        TrackedConnection.opened.append(self)
+    
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def test_features_endpoint_closes_the_connection_without_the_table(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(BACKEND_DIR)
+    import app as dashboard
+    
+    db_path = str(tmp_path / 'students.db')
+    sqlite3.connect(db_path).close()
+    monkeypatch.setattr(dashboard, 'DATABASE', db_path)
+    connect = sqlite3.connect
+    monkeypatch.setattr(dashboard.sqlite3, 'connect', lambda path: connect(path, factory=TrackedConnection))
+    TrackedConnection.opened.clear()
+    
+    response = dashboard.app.test_client().get('/api/students/1/features')
+    
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Feature store not loaded'}
+    assert TrackedConnection.opened and all(conn.closed for conn in TrackedConnection.opened)
@@ -0,0 +1,35 @@
+import os
+import io
+import sqlite3
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+from feature_store import FeatureStore
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dashboards', 'backend')
+
+
+def test_load_features_reads_the_feature_store(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(BACKEND_DIR)
+    from data_loader_db import DataLoader as DashboardLoader
+    
+    monkeypatch.chdir(tmp_path)
+    source = pd.DataFrame({'student_id': [1, 2, 3]})
+    engineered = source.assign(academic_engagement=[55.0, 61.5, 70.25], raw_column=[1, 2, 3])
+    store = FeatureStore(store_dir=os.path.join('models', 'feature_store'), model_dir='models')
+    with contextlib.redirect_stdout(io.StringIO()):
+        store.write(source, engineered, pd.DataFrame(np.eye(3), columns=['a', 'b', 'c']))
+    
+    loader = DashboardLoader(db_name=str(tmp_path / 'students.db'))
+    loader.conn = sqlite3.connect(loader.db_name)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert loader._load_features()
+        table = pd.read_sql_query('SELECT * FROM student_features', loader.conn)
+    finally:
+        loader.conn.close()
+    
+    pd.testing.assert_frame_equal(table, store.student_features(), check_dtype=False)
+    assert 'raw_column' not in table.columns
@@ -0,0 +1,50 @@
+import io
+import os
+import contextlib
+
+import pandas as pd
+
+import data_loader
+from data_loader import DataLoader, write_processed_data
+
+
+def load(loader):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return loader.load_all_data()
+
+
+def test_cache_keeps_only_the_latest_entries(dummy_data_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, 'CACHE_MAX_ENTRIES', 2)
+    cache_dir = str(tmp_path / 'cache')
+    library = os.path.join(dummy_data_dir, '08_library_usage.csv')
+    stat = os.stat(library)
+    
+    keys = []
+    try:
+        for offset in range(3):
+            # A new mtime is a new input fingerprint
+            os.utime(library, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset * 10**9))
+            loader = DataLoader(dummy_data_dir, cache_dir=cache_dir)
+            load(loader)
+            keys.append(loader.cache_key)
+    finally:
+        os.utime(library, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    
+    assert len(set(keys)) == 3
+    assert sorted(os.listdir(cache_dir)) == sorted(f'master_{key[:24]}.pkl' for key in keys[1:])
+
+
+def test_processed_data_is_rewritten_when_the_fingerprint_changes(tmp_path):
+    path = str(tmp_path / 'processed_data.csv')
+    
+    assert write_processed_data(pd.DataFrame({'a': [1]}), 'key-1', path)
+    assert not write_processed_data(pd.DataFrame({'a': [2]}), 'key-1', path)
+    assert pd.read_csv(path)['a'].tolist() == [1]
+    
+    # A cache hit on other inputs still replaces the stale file
+    assert write_processed_data(pd.DataFrame({'a': [3]}), 'key-2', path)
+    assert pd.read_csv(path)['a'].tolist() == [3]
+    
+    # Written without a fingerprint, e.g. by data_loader.py itself
+    assert write_processed_data(pd.DataFrame({'a': [4]}), path=path)
+    assert not os.path.exists(f'{path}.key')
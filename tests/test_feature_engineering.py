@@ -0,0 +1,46 @@
+import io
+import contextlib
+
+import pandas as pd
+import pytest
+
+from data_loader import DataLoader
+from feature_engineering import FeatureEngineer, FEATURE_REGISTRY
+
+
+@pytest.fixture(scope='module')
+def master(dummy_data_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataLoader(dummy_data_dir).load_all_data()
+
+
+def engineer(df, fused):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return FeatureEngineer(fused=fused).engineer_features(df)
+
+
+def assert_same_features(df):
+    # Not the column-by-column fallback, which would compare the legacy path with itself
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert FeatureEngineer(fused=True)._engineer_features_fused(df) is not None
+    fused, legacy = engineer(df, True), engineer(df, False)
+    assert list(fused.columns) == list(legacy.columns)
+    
+    # Integer and flag columns must match exactly, floats to rounding
+    ints = [col for col in legacy.columns if legacy[col].dtype.kind in 'iub']
+    floats = [col for col in legacy.columns if legacy[col].dtype.kind == 'f']
+    pd.testing.assert_frame_equal(fused[ints], legacy[ints], check_exact=True)
+    pd.testing.assert_frame_equal(fused[floats], legacy[floats], check_exact=False, rtol=1e-12, atol=1e-12)
+    pd.testing.assert_frame_equal(fused.drop(columns=ints + floats), legacy.drop(columns=ints + floats))
+
+
+def test_fused_matches_legacy(master):
+    assert set(FEATURE_REGISTRY) <= set(engineer(master, False).columns)
+    assert_same_features(master)
+
+
+def test_fused_matches_legacy_with_missing_inputs(master):
+    # The defaults of absent inputs (e.g. gpa_change = 0 without the GPA columns)
+    optional = ['previous_semester_gpa', 'library_visits', 'extra_category_Sports', 'extra_category_Cultural',
+                'marks_subject_english', 'fee_late_count', 'behavior_positive_count']
+    assert_same_features(master.drop(columns=[col for col in optional if col in master.columns]))
@@ -0,0 +1,54 @@
+import io
+import contextlib
+
+import pandas as pd
+import pytest
+
+from generate_complete_synchronized_data import CompleteSynchronizedDataGenerator
+
+# Tables with a row (or rows) for every student; the others only cover some
+EVERY_STUDENT_TABLES = ['02_family_background', '03_academic_history', '04_daily_attendance', '05_marks_exams',
+                        '06_assignments', '09_fee_payments', '10_extracurricular_registrations']
+ONE_ROW_PER_STUDENT_TABLES = ['02_family_background', '03_academic_history', '10_extracurricular_registrations']
+
+
+def generate(seed, vectorized):
+    generator = CompleteSynchronizedDataGenerator(seed=seed, vectorized=vectorized, scale_factor=0.1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        teachers = generator.generate_teachers()
+        students = generator.generate_students(teachers)
+        tables = generator.generate_student_tables(students)
+    return {'teachers': teachers, '01_students_master': students, **tables}
+
+
+def test_vectorized_generator_is_reproducible():
+    first, second = generate(5, True), generate(5, True)
+    
+    assert list(first) == list(second)
+    for table_name in first:
+        pd.testing.assert_frame_equal(first[table_name], second[table_name], obj=table_name)
+    assert not generate(6, True)['04_daily_attendance'].equals(first['04_daily_attendance'])
+
+
+@pytest.mark.parametrize('vectorized', [False, True])
+def test_student_ids_are_consistent_across_tables(vectorized):
+    tables = generate(5, vectorized)
+    students = tables['01_students_master']
+    student_ids = set(students['student_id'])
+    assert students['student_id'].is_unique
+    assert len(tables) == 13
+    
+    for table_name, df in tables.items():
+        if table_name in ('teachers', '01_students_master'):
+            continue
+        assert set(df['student_id']) <= student_ids, table_name
+        if table_name in EVERY_STUDENT_TABLES:
+            assert set(df['student_id']) == student_ids, table_name
+        if table_name in ONE_ROW_PER_STUDENT_TABLES:
+            assert df['student_id'].is_unique, table_name
+    
+    # Activity sessions belong to activities the student is registered for
+    details = tables['11_extracurricular_details']
+    sessions = tables['12_extracurricular_attendance']
+    registered = set(zip(details['student_id'], details['activity_name']))
+    assert set(zip(sessions['student_id'], sessions['activity_name'])) <= registered
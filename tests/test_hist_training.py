@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store import FeatureStore
+from train_model import DropoutModel
+
+
+def synthetic_store(tmp_path, n=600):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=['f0', 'f1', 'f2', 'f3'])
+    y = pd.Series(np.digitize(X['f0'] + 0.3 * rng.normal(size=n), [-0.5, 0.5]))
+    source = pd.DataFrame({'student_id': np.arange(1, n + 1)})
+    
+    model = DropoutModel()
+    model.split_data(X, y, valid_size=0.1)
+    store = FeatureStore(store_dir=str(tmp_path / 'feature_store'), model_dir=str(tmp_path))
+    store.write(source, source, X, y, model.split_index)
+    return model, store, X, y
+
+
+def test_validation_split_is_disjoint_from_train_and_test(tmp_path):
+    model, store, X, y = synthetic_store(tmp_path)
+    rows = {split: set(store.read_training_rows(split)) for split in ('train', 'valid', 'test')}
+    
+    assert len(rows['valid']) == 48 and len(rows['test']) == 120
+    assert not rows['valid'] & rows['test']
+    assert not rows['valid'] & rows['train']
+    assert not rows['train'] & rows['test']
+    assert len(rows['train'] | rows['valid'] | rows['test']) == len(X)
+    
+    X_valid, y_valid = store.read_training('valid')
+    positions = store.read_training_rows('valid')
+    np.testing.assert_array_equal(X_valid.values, X.values[positions].astype('float32'))
+    np.testing.assert_array_equal(y_valid, y.values[positions])
+
+
+def test_train_hist_evaluates_on_the_untouched_test_split(tmp_path, monkeypatch):
+    model, store, X, y = synthetic_store(tmp_path)
+    evaluated = {}
+    monkeypatch.setattr(model, '_evaluate', lambda X_test, y_test: evaluated.update(y=y_test))
+    model.best_params = {'n_estimators': 20, 'max_depth': 3, 'learning_rate': 0.3}
+    
+    X_test, y_test = model.train_hist(store, batch_rows=100, cache_dir=str(tmp_path / 'cache'))
+    
+    np.testing.assert_array_equal(store.read_training_rows('test'), model.split_index['test'])
+    assert len(evaluated['y']) == len(model.split_index['test'])
+    assert model.model.predict(X_test).shape == (len(y_test),)
+
+
+def test_train_hist_requires_a_validation_split(tmp_path):
+    X = pd.DataFrame(np.zeros((10, 2)), columns=['a', 'b'])
+    y = pd.Series([0, 1] * 5)
+    store = FeatureStore(store_dir=str(tmp_path / 'feature_store'), model_dir=str(tmp_path))
+    store.write(pd.DataFrame({'student_id': range(10)}), pd.DataFrame({'student_id': range(10)}), X, y,
+                {'train': np.arange(8), 'test': np.arange(8, 10)})
+    
+    with pytest.raises(ValueError, match='valid'):
+        DropoutModel().train_hist(store)
@@ -0,0 +1,36 @@
+import io
+import shutil
+import contextlib
+
+import pandas as pd
+import pytest
+
+from data_loader import DataLoader, AS_OF_DATE_COLUMNS
+
+AS_OF = '2025-10-31'
+
+
+def load(data_dir, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataLoader(data_dir, **kwargs).load_all_data()
+
+
+def test_as_of_in_the_future_changes_nothing(dummy_data_dir):
+    pd.testing.assert_frame_equal(load(dummy_data_dir), load(dummy_data_dir, as_of='2100-01-01'))
+
+
+@pytest.mark.parametrize('chunksize', [None, 500])
+def test_as_of_matches_data_without_later_rows(dummy_data_dir, tmp_path, chunksize):
+    # The same dataset with every event row dated after AS_OF physically removed
+    cut_dir = tmp_path / 'cut'
+    shutil.copytree(dummy_data_dir, cut_dir)
+    dropped = 0
+    for table_name, column in AS_OF_DATE_COLUMNS.items():
+        df = pd.read_csv(cut_dir / f'{table_name}.csv')
+        later = pd.to_datetime(df[column]) > pd.Timestamp(AS_OF)
+        df[~later].to_csv(cut_dir / f'{table_name}.csv', index=False)
+        dropped += int(later.any())
+    assert dropped >= 6
+    
+    snapshot = load(dummy_data_dir, as_of=AS_OF, chunksize=chunksize)
+    pd.testing.assert_frame_equal(snapshot, load(str(cut_dir), chunksize=chunksize), check_dtype=False)
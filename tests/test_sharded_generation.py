@@ -0,0 +1,42 @@
+import io
+import os
+import contextlib
+
+import pandas as pd
+import pytest
+
+from generate_complete_synchronized_data import generate_sharded
+
+
+def generate(output_dir, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generate_sharded(str(output_dir), seed=11, scale_factor=0.1, combine=True, **kwargs)
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('block_size', [None, 25])
+def test_output_does_not_depend_on_the_worker_count(tmp_path, block_size):
+    one = generate(tmp_path / 'one', block_size=block_size, max_workers=1)
+    two = generate(tmp_path / 'two', block_size=block_size, max_workers=2)
+    
+    assert one == two
+    assert len(one['shards']) > 1
+    for table_name in one['tables']:
+        csv = f'{table_name}.csv'
+        assert read_bytes(tmp_path / 'one' / csv) == read_bytes(tmp_path / 'two' / csv), table_name
+
+
+def test_manifest_row_counts_match_the_files(tmp_path):
+    manifest = generate(tmp_path, block_size=25, max_workers=2)
+    students = pd.read_csv(tmp_path / '01_students_master.csv')
+    
+    assert sum(shard['students'] for shard in manifest['shards']) == len(students)
+    for table_name, table in manifest['tables'].items():
+        parts = [pd.read_csv(tmp_path / path) if os.path.getsize(tmp_path / path) > 1 else pd.DataFrame()
+                 for path in table['files']]
+        assert sum(len(part) for part in parts) == table['rows'], table_name
+        assert len(pd.read_csv(tmp_path / f'{table_name}.csv')) == table['rows'], table_name
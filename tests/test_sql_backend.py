@@ -0,0 +1,96 @@
+import io
+import os
+import shutil
+import sqlite3
+import contextlib
+
+import pandas as pd
+import pytest
+
+from data_loader import DataLoader
+from sql_backend import SQLiteBackend, make_backend
+from generate_complete_synchronized_data import CompleteSynchronizedDataGenerator
+
+
+def load_master(data_dir, sql_backend=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataLoader(data_dir, sql_backend=sql_backend).load_all_data()
+
+
+def assert_same_master(expected, actual):
+    assert sorted(actual.columns) == sorted(expected.columns)
+    actual = actual[expected.columns]
+    pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_exact=False, rtol=1e-9)
+
+
+def test_sqlite_matches_pandas_and_builds_a_missing_database(dummy_data_dir, tmp_path):
+    db_path = tmp_path / 'db' / 'dummy_data.db'
+    master = load_master(dummy_data_dir, f'sqlite:{db_path}')
+    
+    assert db_path.exists()
+    assert_same_master(load_master(dummy_data_dir), master)
+
+
+def test_duckdb_matches_pandas(dummy_data_dir):
+    pytest.importorskip('duckdb')
+    assert_same_master(load_master(dummy_data_dir), load_master(dummy_data_dir, 'duckdb'))
+
+
+def test_sqlite_rejects_in_memory_database(dummy_data_dir):
+    loader = DataLoader(dummy_data_dir)
+    with pytest.raises(ValueError, match=':memory:'):
+        make_backend(loader, 'sqlite::memory:')
+    with pytest.raises(FileNotFoundError, match='import_tables'):
+        SQLiteBackend(loader, str(dummy_data_dir) + '/missing.db')
+
+
+def backend_for(data_dir, db_path):
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        backend = make_backend(DataLoader(str(data_dir)), f'sqlite:{db_path}')
+    return backend, output.getvalue()
+
+
+def test_sqlite_reimports_when_the_source_files_change(dummy_data_dir, tmp_path):
+    data_dir = tmp_path / 'dummy_data'
+    shutil.copytree(dummy_data_dir, data_dir)
+    db_path = tmp_path / 'dummy_data.db'
+    backend_for(data_dir, db_path)
+    
+    # Same files: the database is reused as it is
+    _, output = backend_for(data_dir, db_path)
+    assert 'Importing' not in output and 're-importing' not in output
+    
+    # Rewritten table: re-imported, and the aggregates follow the new file
+    library = pd.read_csv(data_dir / '08_library_usage.csv')
+    library.iloc[:len(library) // 2].to_csv(data_dir / '08_library_usage.csv', index=False)
+    _, output = backend_for(data_dir, db_path)
+    assert 're-importing' in output
+    assert_same_master(load_master(str(data_dir)), load_master(str(data_dir), f'sqlite:{db_path}'))
+    
+    # Another data_dir with the same files is a different source too
+    _, output = backend_for(dummy_data_dir, db_path)
+    assert 're-importing' in output
+
+
+def test_sqlite_without_import_metadata_is_used_with_a_warning(dummy_data_dir, tmp_path):
+    db_path = tmp_path / 'generated.db'
+    with contextlib.redirect_stdout(io.StringIO()):
+        CompleteSynchronizedDataGenerator(seed=7, scale_factor=0.05).generate_to_sqlite(str(db_path), chunk_size=20)
+    mtime = os.path.getmtime(db_path)
+    
+    backend, output = backend_for(dummy_data_dir, db_path)
+    assert backend.stored_fingerprint() is None
+    assert 'no import metadata' in output
+    assert os.path.getmtime(db_path) == mtime
+
+
+def test_interrupted_import_never_matches(dummy_data_dir, tmp_path):
+    db_path = tmp_path / 'dummy_data.db'
+    backend_for(dummy_data_dir, db_path)
+    connection = sqlite3.connect(db_path)
+    connection.execute('DELETE FROM import_metadata')
+    connection.commit()
+    connection.close()
+    
+    _, output = backend_for(dummy_data_dir, db_path)
+    assert 're-importing' in output
@@ -0,0 +1,71 @@
+import io
+import sqlite3
+import contextlib
+
+import pandas as pd
+
+from generate_complete_synchronized_data import SQLiteBulkWriter, CompleteSynchronizedDataGenerator
+from table_schemas import TABLE_SCHEMAS
+
+
+def column_types(db_path, table):
+    connection = sqlite3.connect(db_path)
+    try:
+        return {row[1]: row[2] for row in connection.execute(f'PRAGMA table_info("{table}")')}
+    finally:
+        connection.close()
+
+
+def test_all_null_first_chunk_keeps_declared_numeric_affinity(tmp_path):
+    db_path = str(tmp_path / 'writer.db')
+    schema = TABLE_SCHEMAS['03_academic_history']
+    first = pd.DataFrame({'student_id': [1, 2], 'previous_semester_gpa': [None, None]})
+    second = pd.DataFrame({'student_id': [3, 4], 'previous_semester_gpa': [7.25, 8.5]})
+    assert first['previous_semester_gpa'].dtype == object
+    
+    writer = SQLiteBulkWriter(db_path)
+    try:
+        writer.write('academic_history', first, schema)
+        writer.write('academic_history', second, schema)
+    finally:
+        writer.close()
+    
+    assert column_types(db_path, 'academic_history') == {'student_id': 'INTEGER', 'previous_semester_gpa': 'REAL'}
+    connection = sqlite3.connect(db_path)
+    try:
+        stored = connection.execute(
+            'SELECT typeof(previous_semester_gpa), COUNT(*) FROM academic_history GROUP BY 1 ORDER BY 1'
+        ).fetchall()
+        values = pd.read_sql_query('SELECT previous_semester_gpa FROM academic_history', connection)
+    finally:
+        connection.close()
+    assert stored == [('null', 2), ('real', 2)]
+    assert values['previous_semester_gpa'].dtype == 'float64'
+
+
+def test_undeclared_columns_follow_the_chunk_dtype(tmp_path):
+    db_path = str(tmp_path / 'writer.db')
+    writer = SQLiteBulkWriter(db_path)
+    try:
+        writer.write('teachers', pd.DataFrame({'teacher_id': [1], 'rating': [4.5], 'name': ['A']}))
+    finally:
+        writer.close()
+    
+    assert column_types(db_path, 'teachers') == {'teacher_id': 'INTEGER', 'rating': 'REAL', 'name': 'TEXT'}
+
+
+def test_generate_to_sqlite_small_chunks_store_numeric_gpa(tmp_path):
+    db_path = str(tmp_path / 'generated.db')
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = CompleteSynchronizedDataGenerator(seed=42, vectorized=True, scale_factor=0.1)
+        generator.generate_to_sqlite(db_path, chunk_size=10)
+    
+    assert column_types(db_path, 'academic_history')['previous_semester_gpa'] == 'REAL'
+    connection = sqlite3.connect(db_path)
+    try:
+        text_values = connection.execute(
+            "SELECT COUNT(*) FROM academic_history WHERE typeof(previous_semester_gpa) = 'text'"
+        ).fetchone()[0]
+    finally:
+        connection.close()
+    assert text_values == 0
@@ -0,0 +1,58 @@
+import io
+import contextlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import DataLoader
+from feature_store import FeatureStore
+from train_model import DropoutModel
+
+
+@pytest.fixture
+def trained(dummy_data_dir, tmp_path, monkeypatch):
+    """A fully trained model and feature store in tmp_path, and the master frame after a CSV round trip"""
+    monkeypatch.setattr(DropoutModel, '_plot_feature_importance', lambda self: None)
+    model_dir = str(tmp_path / 'models')
+    store = FeatureStore(store_dir=str(tmp_path / 'models' / 'feature_store'), model_dir=model_dir)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        master = DataLoader(dummy_data_dir).load_all_data()
+        model = DropoutModel()
+        model.best_params = {'n_estimators': 20, 'max_depth': 3, 'learning_rate': 0.3}
+        X, y = model.prepare_data(master, feature_store=store)
+        model.train(X, y)
+        model.save_model(model_dir)
+        store.write(master, model.engineered_df, X, y, model.split_index)
+    
+    # What the train_model.py CLI reads back from processed_data.csv
+    master.to_csv(tmp_path / 'processed_data.csv', index=False)
+    return model_dir, store, pd.read_csv(tmp_path / 'processed_data.csv')
+
+
+def retrain(df, model_dir, store):
+    model = DropoutModel()
+    model.best_params = {'n_estimators': 20, 'max_depth': 3, 'learning_rate': 0.3}
+    with contextlib.redirect_stdout(io.StringIO()):
+        model.retrain(df, model_dir=model_dir, feature_store=store, new_rounds=5)
+    return model
+
+
+def test_unchanged_master_has_no_changed_rows_after_csv_round_trip(trained):
+    model_dir, store, master = trained
+    assert store.changed_rows(master).sum() == 0
+    
+    model = retrain(master, model_dir, store)
+    assert model.split_index is None
+
+
+def test_only_perturbed_rows_are_retrained_on(trained):
+    model_dir, store, master = trained
+    rows = np.random.default_rng(0).choice(len(master), 30, replace=False)
+    master.loc[rows, 'library_visits'] += 1
+    assert store.changed_rows(master).sum() == 30
+    
+    model = retrain(master, model_dir, store)
+    retrained_on = np.concatenate(list(model.split_index.values()))
+    assert sorted(retrained_on) == sorted(rows)